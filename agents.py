@@ -0,0 +1,102 @@
+# Registry of lazily constructed agents
+
+import threading
+from framework import load_crewai
+
+# Built-in agents, declared as crewai Agent keyword arguments
+DEFAULT_AGENT_SPECS = {
+    'dev_agent': {
+        'role': "Python Developer",
+        'goal': "Write clean Python code for any problem",
+        'backstory': "An expert Python programmer who follows best practices.",
+        'verbose': True,
+    },
+    'doc_agent': {
+        'role': "Technical Documentation Expert",
+        'goal': "Create well-structured, comprehensive, and highly informative documentation with clear explanations, examples, and proper formatting",
+        'backstory': "An expert technical writer with 10+ years of experience creating clear, concise documentation. You excel at breaking down complex topics into digestible sections with examples, use cases, and practical applications. You structure documentation with clear headings, bullet points, and logical flow.",
+        'verbose': True,
+        'max_iter': 5,
+    },
+    'readme_agent': {
+        'role': "README Generator",
+        'goal': "Create professional, detailed, and emojified README.md files from natural language project descriptions",
+        'backstory': "An expert technical writer and project analyst who excels at understanding complex project contexts and transforming them into comprehensive, professional README files.",
+        'verbose': True,
+        'max_iter': 10,
+        'memory': True,
+    },
+    'code_reviewer': {
+        'role': "Senior Code Reviewer",
+        'goal': "Analyze code for bugs, security vulnerabilities, performance issues, and best practices",
+        'backstory': "A seasoned software engineer with 15+ years of experience in code review, security analysis, and performance optimization.",
+        'verbose': True,
+        'max_iter': 8,
+        'memory': True,
+    },
+}
+
+
+class AgentRegistry:
+    """Builds each registered agent on first use and caches it
+
+    Agents are declared with the same keyword arguments crewai's Agent
+    takes. Specs without an explicit 'llm' get the shared LLM returned by
+    llm_factory, which is itself only called when the first agent is built.
+    """
+
+    def __init__(self, llm_factory, specs=None):
+        self.llm_factory = llm_factory
+        self._specs = {}
+        self._agents = {}
+        self._llm = None
+        self._lock = threading.RLock()
+        self.register_many(specs or {})
+
+    def register(self, name, **spec):
+        """Declare an agent by name; re-registering replaces any built instance"""
+        if 'role' not in spec:
+            raise ValueError(f"Agent '{name}' needs at least a role")
+        with self._lock:
+            self._specs[name] = spec
+            self._agents.pop(name, None)
+
+    def register_many(self, specs):
+        """Declare several agents from a {name: spec} mapping"""
+        for name, spec in specs.items():
+            self.register(name, **spec)
+
+    def get(self, name):
+        """Return the agent called name, building it on first use"""
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                if name not in self._specs:
+                    raise KeyError(f"Unknown agent: {name}")
+                agent = self._build(self._specs[name])
+                self._agents[name] = agent
+            return agent
+
+    def _build(self, spec):
+        kwargs = dict(spec)
+        if 'llm' not in kwargs:
+            if self._llm is None:
+                self._llm = self.llm_factory()
+            kwargs['llm'] = self._llm
+        return load_crewai().Agent(**kwargs)
+
+    def name_of(self, agent):
+        """Registered name of a built agent, falling back to its role"""
+        with self._lock:
+            for name, built in self._agents.items():
+                if built is agent:
+                    return name
+        return agent.role
+
+    def names(self):
+        """Names of every registered agent"""
+        return list(self._specs)
+
+    def built(self):
+        """Names of the agents constructed so far"""
+        return list(self._agents)
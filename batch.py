@@ -0,0 +1,61 @@
+# Headless batch runner for JSONL task files
+
+import json
+import time
+import asyncio
+
+JOB_TYPES = ('dev', 'doc', 'readme', 'review')
+
+
+def load_jobs(input_path):
+    """Load jobs from a JSONL file, one job object per line"""
+    jobs = []
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number}: invalid JSON ({e})")
+            if job.get('type') not in JOB_TYPES:
+                raise ValueError(f"Line {line_number}: job type must be one of {', '.join(JOB_TYPES)}")
+            job.setdefault('id', f"job-{line_number}")
+            jobs.append(job)
+    return jobs
+
+
+async def run_batch(jobs, execute_job, output_path, concurrency):
+    """Run jobs concurrently and stream results to output_path in completion order"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    summary = {'total': len(jobs), 'succeeded': 0, 'failed': 0}
+    
+    async def run_job(job):
+        async with semaphore:
+            started = time.perf_counter()
+            record = {'id': job['id'], 'type': job['type']}
+            try:
+                output = await execute_job(job)
+                if isinstance(output, dict):
+                    record.update(status='ok', **output)
+                else:
+                    record.update(status='ok', output=str(output))
+            except Exception as e:
+                record.update(status='error', error=str(e))
+            record['duration_seconds'] = round(time.perf_counter() - started, 3)
+            return record
+    
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for completed in asyncio.as_completed([run_job(job) for job in jobs]):
+            record = await completed
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            
+            if record['status'] == 'ok':
+                summary['succeeded'] += 1
+            else:
+                summary['failed'] += 1
+            print(f"[BATCH] {record['id']} ({record['type']}): {record['status']} in {record['duration_seconds']}s")
+    
+    return summary
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Startup-time regression benchmark for the CrewAI Workshop CLI
+
+Measures cold-start time of the menu/help path in fresh interpreters and
+fails if it regresses past a threshold or if crewai gets imported eagerly.
+
+Usage:
+    python bench_startup.py [--runs 5] [--max-seconds 1.0]
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# Import main and render the menu and help screens, as the CLI does on startup
+STARTUP_SNIPPET = (
+    "import sys, main; "
+    "main.check_api_keys(); main.show_main_menu(); main.show_help(); "
+    "sys.exit(3 if 'crewai' in sys.modules else 0)"
+)
+
+
+def time_startup():
+    """Time one cold start in a fresh interpreter"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode == 3:
+        raise RuntimeError("crewai was imported during startup")
+    if completed.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{completed.stderr}")
+    return elapsed
+
+
+def main():
+    """Run the benchmark and exit non-zero on regression"""
+    parser = argparse.ArgumentParser(description="Startup-time regression benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure")
+    parser.add_argument("--max-seconds", type=float, default=1.0,
+                        help="Fail if the median cold start exceeds this many seconds")
+    args = parser.parse_args()
+
+    try:
+        timings = [time_startup() for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    median = statistics.median(timings)
+    print(f"[STATS] Cold start over {args.runs} runs: "
+          f"median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s")
+
+    if median > args.max_seconds:
+        print(f"[ERROR] Startup regression: median {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+    print(f"[OK] Startup within budget ({args.max_seconds:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Persistent response cache for Crew.kickoff results
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from config import CACHE_CONFIG
+
+
+def make_cache_key(model, temperature, agent_role, description, expected_output):
+    """Build a stable cache key from everything that shapes an LLM response"""
+    payload = json.dumps(
+        [model, temperature, agent_role, description, expected_output],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """On-disk LRU cache of crew responses with TTL expiry and hit/miss counters"""
+
+    def __init__(self, cache_file=None, max_entries=None, ttl_seconds=None, enabled=None, autosave=True):
+        self.cache_file = cache_file or CACHE_CONFIG['cache_file']
+        self.max_entries = max_entries or CACHE_CONFIG['max_entries']
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else CACHE_CONFIG['ttl_seconds']
+        self.enabled = CACHE_CONFIG['enabled'] if enabled is None else enabled
+        # Without autosave new entries are only written to disk by flush()
+        self.autosave = autosave
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.enabled:
+            self._load()
+
+    def _load(self):
+        """Load cached entries from disk, oldest first"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    for key, entry in json.load(f).get('entries', []):
+                        self.entries[key] = entry
+        except Exception as e:
+            print(f"Warning: Could not load response cache: {e}")
+            self.entries.clear()
+
+    def _save(self):
+        """Atomically write the cache to disk in LRU order"""
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'entries': list(self.entries.items())}, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"Warning: Could not save response cache: {e}")
+
+    def _is_expired(self, entry):
+        return self.ttl_seconds > 0 and time.time() - entry['created_at'] > self.ttl_seconds
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    del self.entries[key]
+                    self._dirty = True
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self._dirty = True
+            self.hits += 1
+            return entry['value']
+
+    def set(self, key, value):
+        """Store a response, evicting least recently used entries past the size bound"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.entries[key] = {'value': value, 'created_at': time.time()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            if self.autosave:
+                self._save()
+            else:
+                self._dirty = True
+
+    def flush(self):
+        """Persist pending entries and LRU order changes"""
+        with self._lock:
+            if self.enabled and self._dirty:
+                self._save()
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self.entries.clear()
+            self._save()
+
+    def stats(self):
+        """Return hit/miss counters for this session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,167 @@
+# AST-aware chunking of large Python sources for code review
+
+import ast
+import copy
+from config import REVIEW_CONFIG
+from utils import estimate_tokens
+
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+IMPORT_NODES = (ast.Import, ast.ImportFrom)
+
+
+def _node_start(node):
+    """First source line of a node, including its decorators"""
+    decorators = getattr(node, 'decorator_list', [])
+    return min([node.lineno] + [d.lineno for d in decorators])
+
+
+def _signature(node):
+    """Render a definition as its signature with an elided body"""
+    stub = copy.copy(node)
+    stub.decorator_list = []
+    elided = [ast.Expr(ast.Constant(Ellipsis))]
+    if isinstance(node, ast.ClassDef):
+        stub.body = [_signature(child) for child in node.body if isinstance(child, DEFINITION_NODES)] or elided
+    else:
+        stub.body = elided
+    return stub
+
+
+def build_shared_header(tree):
+    """Collect the imports and top-level signatures shared by every chunk"""
+    imports = [ast.unparse(node) for node in tree.body if isinstance(node, IMPORT_NODES)]
+    signatures = [ast.unparse(_signature(node)) for node in tree.body if isinstance(node, DEFINITION_NODES)]
+    return "\n".join(imports + [""] + signatures).strip()
+
+
+def _split_units(body, lines, prefix=''):
+    """Split a statement list into definition units and runs of other statements"""
+    units = []
+    pending = []
+
+    def flush_pending():
+        if pending:
+            start, end = _node_start(pending[0]), pending[-1].end_lineno
+            label = f"{prefix}<class body>" if prefix else "<module code>"
+            units.append({'name': label, 'start': start, 'end': end})
+            pending.clear()
+
+    for node in body:
+        if isinstance(node, IMPORT_NODES) and not prefix:
+            continue
+        if isinstance(node, DEFINITION_NODES):
+            flush_pending()
+            units.append({'name': f"{prefix}{node.name}", 'start': _node_start(node),
+                          'end': node.end_lineno, 'node': node})
+        else:
+            pending.append(node)
+    flush_pending()
+
+    for unit in units:
+        unit['source'] = "\n".join(lines[unit['start'] - 1:unit['end']])
+    return units
+
+
+def _fit_unit(unit, lines, budget):
+    """Break an oversized unit at method boundaries, then at line boundaries"""
+    if estimate_tokens(unit['source']) <= budget:
+        return [unit]
+
+    node = unit.get('node')
+    if isinstance(node, ast.ClassDef) and any(isinstance(child, DEFINITION_NODES) for child in node.body):
+        class_line = lines[_node_start(node) - 1:node.body[0].lineno - 1]
+        parts = []
+        for member in _split_units(node.body, lines, prefix=f"{node.name}."):
+            member['source'] = "\n".join(class_line + [member['source']])
+            parts.extend(_fit_unit(member, lines, budget))
+        return parts
+
+    parts = []
+    start = unit['start']
+    current = []
+    for line_number in range(unit['start'], unit['end'] + 1):
+        current.append(lines[line_number - 1])
+        if estimate_tokens("\n".join(current)) >= budget:
+            parts.append({'name': f"{unit['name']} (partial)", 'start': start,
+                          'end': line_number, 'source': "\n".join(current)})
+            start = line_number + 1
+            current = []
+    if current:
+        parts.append({'name': f"{unit['name']} (partial)", 'start': start,
+                      'end': unit['end'], 'source': "\n".join(current)})
+    return parts
+
+
+def unit_budget(header, max_tokens=None):
+    """Token budget left for code once the shared header is included"""
+    max_tokens = max_tokens or REVIEW_CONFIG['chunk_max_tokens']
+    return max(max_tokens - estimate_tokens(header), max_tokens // 2)
+
+
+def split_python_units(source, max_tokens=None):
+    """Split Python source into token-bounded function, class and statement units
+
+    Returns (header, units), or None when the source is not valid Python.
+    """
+    max_tokens = max_tokens or REVIEW_CONFIG['chunk_max_tokens']
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+
+    lines = source.splitlines()
+    header = build_shared_header(tree)
+    budget = unit_budget(header, max_tokens)
+
+    units = []
+    for unit in _split_units(tree.body, lines):
+        units.extend(_fit_unit(unit, lines, budget))
+    return header, units
+
+
+def pack_units(units, budget):
+    """Group consecutive units into batches whose joined source stays within budget"""
+    batches = []
+    current = []
+    for unit in units:
+        current_source = "\n\n".join(u['source'] for u in current + [unit])
+        if current and estimate_tokens(current_source) > budget:
+            batches.append(current)
+            current = []
+        current.append(unit)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def chunk_python_source(source, max_tokens=None):
+    """Split Python source into token-bounded chunks at function and class boundaries
+
+    Returns a list of chunks, or None when the source is not valid Python.
+    """
+    max_tokens = max_tokens or REVIEW_CONFIG['chunk_max_tokens']
+    split = split_python_units(source, max_tokens)
+    if split is None:
+        return None
+
+    header, units = split
+    chunks = pack_units(units, unit_budget(header, max_tokens))
+
+    return [{
+        'header': header,
+        'code': "\n\n".join(unit['source'] for unit in chunk),
+        'start_line': chunk[0]['start'],
+        'end_line': chunk[-1]['end'],
+        'units': [unit['name'] for unit in chunk],
+    } for chunk in chunks]
+
+
+def assemble_chunk_reviews(chunks, reports):
+    """Reassemble per-chunk review reports into a single report in source order"""
+    sections = []
+    for index, (chunk, report) in enumerate(zip(chunks, reports), 1):
+        sections.append(
+            f"## Part {index}/{len(chunks)}: lines {chunk['start_line']}-{chunk['end_line']}\n\n"
+            f"**Covers:** {', '.join(chunk['units'])}\n\n{str(report).strip()}"
+        )
+    return "\n\n".join(sections)
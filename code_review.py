@@ -0,0 +1,238 @@
+# Repository-scale code review helpers
+
+import os
+import re
+import ast
+import glob
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import REVIEW_CONFIG
+
+PRIORITY_LEVELS = ['Critical', 'High', 'Medium', 'Low']
+
+PRIORITY_PATTERN = re.compile(
+    r'(?:priority(?:\s+level)?\s*[:\-]?\s*|[\[(]|\*\*)\s*(critical|high|medium|low)\b',
+    re.IGNORECASE
+)
+BULLET_PATTERN = re.compile(r'^(?:[-*>#]+\s+|\d+\.\s+)+')
+SCORE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*10\b')
+
+
+def collect_review_files(target):
+    """Expand a directory or glob pattern into a sorted list of source files"""
+    extensions = tuple(REVIEW_CONFIG['file_extensions'])
+    exclude_dirs = set(REVIEW_CONFIG['exclude_dirs'])
+    
+    if os.path.isdir(target):
+        paths = []
+        for root, dirs, files in os.walk(target):
+            dirs[:] = [d for d in dirs if d not in exclude_dirs]
+            paths.extend(os.path.join(root, name) for name in files if name.endswith(extensions))
+        return sorted(paths)
+    
+    return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+
+
+def review_files_parallel(paths, review_file, max_workers=None):
+    """Review files on a bounded worker pool, returning reports and errors keyed by path"""
+    max_workers = max_workers or REVIEW_CONFIG['max_workers']
+    reports = {}
+    errors = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(review_file, path): path for path in paths}
+        for completed, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            try:
+                reports[path] = str(future.result())
+                print(f"[REVIEW] ({completed}/{len(paths)}) [OK] {path}")
+            except Exception as e:
+                errors[path] = str(e)
+                print(f"[REVIEW] ({completed}/{len(paths)}) [ERROR] {path}: {e}")
+    
+    return reports, errors
+
+
+def extract_issues(report):
+    """Pull (priority, text) pairs out of a review report"""
+    issues = []
+    for line in report.splitlines():
+        match = PRIORITY_PATTERN.search(line)
+        if match:
+            text = BULLET_PATTERN.sub('', line.strip())
+            issues.append((match.group(1).capitalize(), text))
+    return issues
+
+
+def extract_quality_score(report):
+    """Return the overall 1-10 quality rating from a report, if present"""
+    scores = [float(score) for score in SCORE_PATTERN.findall(report) if float(score) <= 10]
+    return scores[-1] if scores else None
+
+
+def merge_review_reports(reports, errors=None):
+    """Merge per-file reports into one markdown report ranked by priority"""
+    errors = errors or {}
+    ranked = []
+    scores = []
+    
+    for path in sorted(reports):
+        for priority, text in extract_issues(reports[path]):
+            ranked.append((PRIORITY_LEVELS.index(priority), path, text))
+        score = extract_quality_score(reports[path])
+        if score is not None:
+            scores.append(score)
+    ranked.sort(key=lambda issue: (issue[0], issue[1]))
+    
+    lines = ["## Summary", ""]
+    lines.append(f"- **Files reviewed:** {len(reports)}")
+    if errors:
+        lines.append(f"- **Files failed:** {len(errors)}")
+    for level, priority in enumerate(PRIORITY_LEVELS):
+        lines.append(f"- **{priority} issues:** {sum(1 for issue in ranked if issue[0] == level)}")
+    if scores:
+        lines.append(f"- **Average quality score:** {sum(scores) / len(scores):.1f}/10")
+    
+    lines.extend(["", "## Issues by Priority"])
+    current_level = None
+    for level, path, text in ranked:
+        if level != current_level:
+            lines.extend(["", f"### {PRIORITY_LEVELS[level]}", ""])
+            current_level = level
+        lines.append(f"- `{path}`: {text}")
+    
+    if errors:
+        lines.extend(["", "## Failed Files", ""])
+        lines.extend(f"- `{path}`: {error}" for path, error in sorted(errors.items()))
+    
+    lines.extend(["", "## File Reports", ""])
+    for path in sorted(reports):
+        lines.extend([f"### {path}", "", reports[path].strip(), ""])
+    
+    return "\n".join(lines)
+
+
+def unit_fingerprint(unit, salt=''):
+    """Hash a review unit's normalized AST so formatting-only edits keep the same key"""
+    if 'node' in unit:
+        normalized = ast.dump(unit['node'])
+    else:
+        normalized = "\n".join(line.strip() for line in unit['source'].splitlines() if line.strip())
+    payload = f"{salt}\n{unit['name']}\n{normalized}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def unit_heading_pattern(name):
+    """Markdown heading line that opens the findings for a unit"""
+    return re.compile(rf"^#+\s*[`*]*{re.escape(name)}[`*]*(?=[\s:(]|$).*$", re.MULTILINE)
+
+
+def split_unit_findings(report, names):
+    """Per-unit sections of a report that gives each unit its own '### <name>' heading
+
+    Units without a heading in the report are left out.
+    """
+    starts = []
+    for name in names:
+        match = unit_heading_pattern(name).search(report)
+        if match:
+            starts.append((match.start(), match.end(), name))
+    starts.sort()
+    
+    sections = {}
+    for index, (start, body_start, name) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else len(report)
+        sections[name] = report[body_start:end].strip()
+    return sections
+
+
+def review_units_incremental(units, review_batch, pack, unit_cache, salt='', max_workers=None):
+    """Review units without stored findings in packed batches, reusing the rest from unit_cache
+
+    pack groups the pending units into batches and review_batch(batch) returns
+    one report with a '### <unit name>' section per unit. Findings are only
+    stored per unit; a report that does not cover every unit of its batch is
+    kept whole instead.
+    
+    Returns the per-unit reports (None where only a batch report covers the
+    unit), matching reused flags and the (batch, report) pairs reviewed.
+    """
+    max_workers = max_workers or REVIEW_CONFIG['max_workers']
+    fingerprints = [unit_fingerprint(unit, salt) for unit in units]
+    reports = [unit_cache.get(fingerprint) for fingerprint in fingerprints]
+    reused = [report is not None for report in reports]
+    pending = [index for index, report in enumerate(reports) if report is None]
+    if not pending:
+        return reports, reused, []
+    
+    batches = pack([units[index] for index in pending])
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        batch_reports = list(zip(batches, pool.map(lambda batch: str(review_batch(batch)), batches)))
+    
+    index_of = {id(units[index]): index for index in pending}
+    for batch, report in batch_reports:
+        sections = split_unit_findings(report, [unit['name'] for unit in batch])
+        for unit in batch:
+            if unit['name'] in sections:
+                index = index_of[id(unit)]
+                reports[index] = sections[unit['name']]
+                unit_cache.set(fingerprints[index], reports[index])
+    
+    return reports, reused, batch_reports
+
+
+def assemble_unit_reviews(units, reports, reused, batch_reports=()):
+    """Combine per-unit findings into a single report in source order
+
+    Batch reports that could not be split per unit are appended whole.
+    """
+    sections = []
+    for unit, report, was_reused in zip(units, reports, reused):
+        if report is None:
+            continue
+        status = " (unchanged - findings reused)" if was_reused else ""
+        sections.append(f"## {unit['name']}: lines {unit['start']}-{unit['end']}{status}\n\n{report.strip()}")
+    
+    covered = {id(unit) for unit, report in zip(units, reports) if report is not None}
+    for batch, report in batch_reports:
+        if any(id(unit) not in covered for unit in batch):
+            names = ", ".join(unit['name'] for unit in batch)
+            sections.append(f"## {names}: lines {batch[0]['start']}-{batch[-1]['end']}\n\n{report.strip()}")
+    return "\n\n".join(sections)
+
+
+def get_git_diff(revision='HEAD', context_lines=None):
+    """Return the unified diff against a revision with minimal surrounding context"""
+    if context_lines is None:
+        context_lines = REVIEW_CONFIG['diff_context_lines']
+    completed = subprocess.run(
+        ['git', 'diff', f'-U{context_lines}', revision, '--'],
+        capture_output=True, text=True, encoding='utf-8', errors='replace', check=True
+    )
+    return completed.stdout
+
+
+def split_diff_by_file(diff_text):
+    """Split a unified diff into per-file diffs keyed by path, skipping deletions"""
+    file_diffs = {}
+    path = None
+    current = []
+    
+    def flush_file():
+        if path and any(line.startswith('@@') for line in current):
+            file_diffs[path] = "\n".join(current)
+    
+    for line in diff_text.splitlines():
+        if line.startswith('diff --git '):
+            flush_file()
+            path = None
+            current = [line]
+            continue
+        current.append(line)
+        if line.startswith('+++ '):
+            target = line[4:].strip()
+            path = None if target == '/dev/null' else target[2:] if target.startswith('b/') else target
+    flush_file()
+    
+    return file_diffs
@@ -0,0 +1,246 @@
+# Token-reducing compression of code sent for review
+#
+# Review findings are about structure, names and logic, none of which
+# depend on trailing whitespace, runs of blank lines or the contents of
+# large data literals. Those are normalized or replaced with placeholders
+# (and docstrings optionally dropped) before the code goes into a prompt.
+
+import io
+import re
+import ast
+import tokenize
+import threading
+from config import REVIEW_CONFIG
+from utils import estimate_tokens
+
+BASE64_RUN = re.compile(r"[A-Za-z0-9+/]{80,}={0,2}")
+NUMBER = r"[-+]?(?:0[xX][0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+NUMBER_RUN = re.compile(rf"(?:{NUMBER}\s*,\s*){{31,}}{NUMBER}")
+QUOTED_STRING = re.compile(r"""("|')(?:\\.|(?!\1)[^\\\n])*\1""")
+HEX_BODY = re.compile(r"(?:\\x[0-9a-fA-F]{2})+|[0-9a-fA-F]+")
+BASE64_BODY = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+SQL_KEYWORD = re.compile(r"\b(?:SELECT|INSERT|UPDATE|DELETE|FROM|WHERE|JOIN|CREATE|ALTER|DROP)\b", re.IGNORECASE)
+FORMAT_FIELD = re.compile(r"\{[^{}]*\}|%(?:\([^)]*\))?[-+ #0]*\d*(?:\.\d+)?[sdifrxXeEgGc]")
+
+
+def _docstring_nodes(tree):
+    """Expression statements holding module, class and function docstrings"""
+    owners = [tree] + [node for node in ast.walk(tree)
+                       if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+    for owner in owners:
+        first = owner.body[0] if owner.body else None
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            yield first
+
+
+def strip_docstrings(code):
+    """Replace docstrings with a one-line placeholder, keeping the code valid"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, 0
+    lines = code.splitlines()
+    nodes = sorted(_docstring_nodes(tree), key=lambda node: node.lineno, reverse=True)
+    for node in nodes:
+        start, end = node.lineno - 1, node.end_lineno
+        prefix = lines[start][:node.col_offset]
+        lines[start:end] = [prefix + '"""..."""']
+    return "\n".join(lines), len(nodes)
+
+
+def _literal_placeholder(literal):
+    """Same-quoted placeholder recording the size of a collapsed literal"""
+    prefix = re.match(r"[rRbBuUfF]*", literal).group(0)
+    quote = literal[len(prefix)]
+    return f"{prefix}{quote}<{len(literal)}-char literal>{quote}"
+
+
+def _is_base64(run):
+    """Whether a run mixes cases and digits, as base64 does and identifiers or paths do not"""
+    return bool(re.search(r"[a-z]", run) and re.search(r"[A-Z]", run) and re.search(r"\d", run))
+
+
+def is_data_literal(literal):
+    """Whether a string literal holds data rather than text the reviewer needs
+    
+    Encoded runs (base64, hex, \\x escapes) and long strings without
+    whitespace are data; f-strings and strings with SQL keywords or format
+    fields never are.
+    """
+    prefix = re.match(r"[rRbBuUfF]*", literal).group(0)
+    if 'f' in prefix.lower():
+        return False
+    body = literal[len(prefix):]
+    quote = body[:3] if body[:3] in ('"""', "'''") else body[0]
+    body = body[len(quote):-len(quote)]
+    if SQL_KEYWORD.search(body) or FORMAT_FIELD.search(body):
+        return False
+    # Encoded data may be wrapped over several lines
+    compact = re.sub(r"\s+", "", body)
+    if HEX_BODY.fullmatch(compact) or (BASE64_BODY.fullmatch(compact) and _is_base64(compact)):
+        return True
+    return not re.search(r"\s", body)
+
+
+def _collapse_python_strings(code, max_chars):
+    """Collapse long data string tokens other than docstrings, or None if code does not tokenize"""
+    try:
+        tree = ast.parse(code)
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (SyntaxError, tokenize.TokenError):
+        return None
+    docstrings = {(node.lineno, node.col_offset) for node in _docstring_nodes(tree)}
+
+    offsets = [0]
+    for line in code.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+
+    pieces = []
+    last = 0
+    collapsed = 0
+    for token in tokens:
+        if (token.type == tokenize.STRING and len(token.string) > max_chars
+                and token.start not in docstrings and is_data_literal(token.string)):
+            start = offsets[token.start[0] - 1] + token.start[1]
+            end = offsets[token.end[0] - 1] + token.end[1]
+            pieces.append(code[last:start])
+            pieces.append(_literal_placeholder(token.string))
+            last = end
+            collapsed += 1
+    pieces.append(code[last:])
+    return "".join(pieces), collapsed
+
+
+def collapse_literals(code, max_chars):
+    """Replace base64 runs, long data string literals and long number arrays with placeholders"""
+    collapsed = [0]
+
+    def collapse_base64(match):
+        run = match.group(0)
+        if not _is_base64(run):
+            return run
+        collapsed[0] += 1
+        return f"<{len(run)}-char base64>"
+
+    def collapse_string(match):
+        if len(match.group(0)) <= max_chars or not is_data_literal(match.group(0)):
+            return match.group(0)
+        collapsed[0] += 1
+        return _literal_placeholder(match.group(0))
+
+    code = BASE64_RUN.sub(collapse_base64, code)
+
+    python_result = _collapse_python_strings(code, max_chars)
+    if python_result is not None:
+        code, strings = python_result
+        collapsed[0] += strings
+    else:
+        # Not Python (or not complete Python): fall back to single-line quoted strings
+        code = QUOTED_STRING.sub(collapse_string, code)
+
+    code, number_runs = NUMBER_RUN.subn(
+        lambda match: f"<{match.group(0).count(',') + 1} numbers>", code
+    )
+    return code, collapsed[0] + number_runs
+
+
+def collapse_diff_literals(diff, max_chars):
+    """collapse_literals applied line by line to a unified diff, keeping markers and hunk line counts"""
+    lines = []
+    collapsed = 0
+    for line in diff.splitlines():
+        if line[:1] in (' ', '+', '-') and not line.startswith(('+++ ', '--- ')):
+            body, count = collapse_literals(line[1:], max_chars)
+            line = line[0] + body
+            collapsed += count
+        lines.append(line)
+    return "\n".join(lines), collapsed
+
+
+def _string_rows(code):
+    """Rows whose line ends inside a string token, and rows that start inside one
+
+    Either set is empty when the code does not tokenize as Python.
+    """
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (SyntaxError, tokenize.TokenError):
+        return set(), set()
+    open_ends, continued = set(), set()
+    for token in tokens:
+        if token.type == tokenize.STRING and token.end[0] > token.start[0]:
+            open_ends.update(range(token.start[0], token.end[0]))
+            continued.update(range(token.start[0] + 1, token.end[0] + 1))
+    return open_ends, continued
+
+
+def normalize_whitespace(code):
+    """Strip trailing whitespace and collapse runs of blank lines into one
+
+    Lines inside multi-line strings are left as they are.
+    """
+    open_ends, continued = _string_rows(code)
+    normalized = []
+    for row, line in enumerate(code.splitlines(), 1):
+        if row in continued:
+            normalized.append(line if row in open_ends else line.rstrip())
+            continue
+        line = line if row in open_ends else line.rstrip()
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return "\n".join(normalized).strip("\n")
+
+
+class CodeCompressor:
+    """Shrinks review input and tracks the tokens saved"""
+
+    def __init__(self, enabled=None, strip_docstrings=None, max_literal_chars=None):
+        self.enabled = REVIEW_CONFIG['compress'] if enabled is None else enabled
+        self.strip_docstrings = (REVIEW_CONFIG['strip_docstrings']
+                                 if strip_docstrings is None else strip_docstrings)
+        self.max_literal_chars = max_literal_chars or REVIEW_CONFIG['max_literal_chars']
+        self.requests = 0
+        self.original_tokens = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+    def settings_key(self):
+        """The settings that shape compressed output, for cache keys"""
+        return f"compress={self.enabled},docstrings={self.strip_docstrings},literals={self.max_literal_chars}"
+
+    def compress(self, code, diff=False):
+        """Compressed code and the estimated number of tokens it saves
+
+        Unified diffs only get their literals collapsed within each line:
+        whitespace is left alone, since a blank context line is a single
+        space and hunk headers count every line.
+        """
+        if not self.enabled or not code:
+            return code, 0
+        original_tokens = estimate_tokens(code)
+        if diff:
+            compressed, _ = collapse_diff_literals(code, self.max_literal_chars)
+        else:
+            compressed = code
+            if self.strip_docstrings:
+                compressed, _ = strip_docstrings(compressed)
+            compressed, _ = collapse_literals(compressed, self.max_literal_chars)
+            compressed = normalize_whitespace(compressed)
+
+        saved = max(original_tokens - estimate_tokens(compressed), 0)
+        with self._lock:
+            self.requests += 1
+            self.original_tokens += original_tokens
+            self.saved_tokens += saved
+        return compressed, saved
+
+    def stats(self):
+        """Requests compressed and tokens saved this session"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'original_tokens': self.original_tokens,
+                'saved_tokens': self.saved_tokens,
+                'saved_ratio': self.saved_tokens / self.original_tokens if self.original_tokens else 0.0,
+            }
@@ -17,6 +17,59 @@ GROQ_CONFIG = {
     'top_p': float(os.getenv('GROQ_TOP_P', 1)),
     'stream': os.getenv('GROQ_STREAM', 'true').lower() == 'true',
     'stop': None,
+    'base_url': os.getenv('GROQ_BASE_URL') or None,
+}
+
+# Client-side limits applied before calls reach GROQ (free tier defaults)
+RATE_LIMIT_CONFIG = {
+    'enabled': os.getenv('GROQ_RATE_LIMIT', 'true').lower() == 'true',
+    'requests_per_minute': int(os.getenv('GROQ_RPM', 30)),
+    'tokens_per_minute': int(os.getenv('GROQ_TPM', 6000)),
+    'max_retries': int(os.getenv('GROQ_MAX_RETRIES', 5)),
+    'max_backoff_seconds': float(os.getenv('GROQ_MAX_BACKOFF', 60)),
+}
+
+# ============================================================================
+# 🧮 Token Budget Configuration
+# ============================================================================
+
+TOKEN_CONFIG = {
+    # 'tiktoken' counts with a local encoding (falls back to ~4 chars/token), 'heuristic' skips it
+    'tokenizer': os.getenv('TOKENIZER', 'tiktoken'),
+    'encoding': os.getenv('TOKENIZER_ENCODING', 'cl100k_base'),
+    # Size max_tokens per task type instead of using one global limit
+    'budgeting': os.getenv('TOKEN_BUDGETING', 'true').lower() == 'true',
+    'budgets': {
+        'dev_snippet': 512,
+        'dev_custom': 1536,
+        'doc_outline': 384,
+        'doc_section': 1024,
+        'doc_consistency': 768,
+        'doc_report': 3072,
+        'doc_custom': 3072,
+        'readme': 4096,
+        'readme_section': 1024,
+        'code_review': 2048,
+        'code_review_chunk': 1536,
+        'code_review_unit': 1024,
+        'code_review_diff': 1536,
+    },
+    'context_windows': {
+        'llama-3.1-8b-instant': 131072,
+        'llama-3.3-70b-versatile': 131072,
+        'llama3-8b-8192': 8192,
+        'llama3-70b-8192': 8192,
+        'gemma2-9b-it': 8192,
+    },
+    'default_context_window': int(os.getenv('MODEL_CONTEXT_WINDOW', 8192)),
+    # Tokens the framework adds around the agent and task text
+    'prompt_overhead': int(os.getenv('PROMPT_OVERHEAD_TOKENS', 60)),
+    # Tool-use format instructions crewai adds for agents with tools (memory agents get memory tools)
+    'tool_prompt_overhead': int(os.getenv('TOOL_PROMPT_OVERHEAD_TOKENS', 130)),
+    # Instructions crewai wraps around the task and answer in its memory extraction call
+    'memory_prompt_overhead': int(os.getenv('MEMORY_PROMPT_OVERHEAD_TOKENS', 520)),
+    # Requests whose prompt leaves less room than this for the answer are rejected
+    'min_completion_tokens': int(os.getenv('MIN_COMPLETION_TOKENS', 256)),
 }
 
 # ============================================================================
@@ -59,7 +112,12 @@ FILE_CONFIG = {
 PERFORMANCE_CONFIG = {
     'enable_metrics': True,
     'save_metrics': True,
-    'metrics_file': 'performance_metrics.json'
+    'metrics_file': 'performance_metrics.json',  # legacy counters, imported once
+    'metrics_db': os.getenv('METRICS_DB', 'performance_metrics.db'),
+    'flush_interval_seconds': float(os.getenv('METRICS_FLUSH_INTERVAL', 5)),
+    'enable_exporter': os.getenv('METRICS_EXPORTER', 'false').lower() == 'true',
+    'exporter_host': os.getenv('METRICS_EXPORTER_HOST', '127.0.0.1'),
+    'exporter_port': int(os.getenv('METRICS_EXPORTER_PORT', 9464)),
 }
 
 # ============================================================================
@@ -71,4 +129,178 @@ WORKSHOP_CONFIG = {
     'description': 'Learn multi-agent systems with free tools',
     'free_tier_enabled': True,
     'show_provider_info': True,
-}
\ No newline at end of file
+}
+
+# ============================================================================
+# 💾 Response Cache Configuration
+# ============================================================================
+
+CACHE_CONFIG = {
+    'enabled': os.getenv('CREW_CACHE_ENABLED', 'true').lower() == 'true',
+    'cache_file': os.getenv('CREW_CACHE_FILE', 'response_cache.json'),
+    'max_entries': int(os.getenv('CREW_CACHE_MAX_ENTRIES', 256)),
+    'ttl_seconds': int(os.getenv('CREW_CACHE_TTL', 86400)),  # 24 hours
+}
+
+# ============================================================================
+# 🧠 Semantic Cache Configuration
+# ============================================================================
+
+SEMANTIC_CACHE_CONFIG = {
+    # Serve near-identical free-text dev/doc requests from earlier answers
+    'enabled': os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true',
+    # Estimated Jaccard similarity of content words needed for a hit
+    'threshold': float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.8)),
+    'num_perm': int(os.getenv('SEMANTIC_CACHE_NUM_PERM', 128)),
+    'max_entries': int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', 1024)),
+    'ttl_seconds': int(os.getenv('SEMANTIC_CACHE_TTL', 86400)),  # 24 hours
+    'seed': 1,
+}
+
+# ============================================================================
+# 📦 Batch Configuration
+# ============================================================================
+
+BATCH_CONFIG = {
+    'concurrency': int(os.getenv('BATCH_CONCURRENCY', 4)),
+    'output_file': os.getenv('BATCH_OUTPUT_FILE', ''),
+}
+
+# ============================================================================
+# 📝 Documentation Configuration
+# ============================================================================
+
+DOC_CONFIG = {
+    # Outline long documents, then write their sections concurrently
+    'fan_out': os.getenv('DOC_FAN_OUT', 'true').lower() == 'true',
+    'section_workers': int(os.getenv('DOC_SECTION_WORKERS', 4)),
+}
+
+# ============================================================================
+# 📄 README Generator Configuration
+# ============================================================================
+
+README_CONFIG = {
+    # Sections regenerated concurrently when feedback touches several of them
+    'section_workers': int(os.getenv('README_SECTION_WORKERS', 4)),
+}
+
+# ============================================================================
+# 🔍 Code Review Configuration
+# ============================================================================
+
+REVIEW_CONFIG = {
+    'max_workers': int(os.getenv('REVIEW_MAX_WORKERS', 4)),
+    'file_extensions': ['.py', '.js', '.ts', '.java', '.go', '.rb', '.php', '.cs', '.c', '.cpp', '.h', '.rs'],
+    'exclude_dirs': ['.git', '__pycache__', 'node_modules', 'venv', '.venv', 'crewai_workshop'],
+    'chunk_max_tokens': int(os.getenv('REVIEW_CHUNK_MAX_TOKENS', 1500)),
+    'incremental': os.getenv('REVIEW_INCREMENTAL', 'true').lower() == 'true',
+    'unit_cache_file': os.getenv('REVIEW_UNIT_CACHE_FILE', 'review_unit_cache.json'),
+    'unit_cache_enabled': os.getenv('REVIEW_UNIT_CACHE_ENABLED', 'true').lower() == 'true',
+    'unit_cache_max_entries': int(os.getenv('REVIEW_UNIT_CACHE_MAX_ENTRIES', 2048)),
+    'unit_cache_ttl_seconds': int(os.getenv('REVIEW_UNIT_CACHE_TTL', 604800)),  # 7 days
+    'diff_context_lines': int(os.getenv('REVIEW_DIFF_CONTEXT_LINES', 3)),
+    # Normalize whitespace and collapse large literals before code goes into a prompt
+    'compress': os.getenv('REVIEW_COMPRESS', 'true').lower() == 'true',
+    'strip_docstrings': os.getenv('REVIEW_STRIP_DOCSTRINGS', 'false').lower() == 'true',
+    'max_literal_chars': int(os.getenv('REVIEW_MAX_LITERAL_CHARS', 200)),
+}
+
+# ============================================================================
+# 📡 Streaming Configuration
+# ============================================================================
+
+STREAM_CONFIG = {
+    'enabled': GROQ_CONFIG['stream'],
+    'echo': True,
+    'stream_dir': os.getenv('STREAM_DIR', 'streams'),
+}
+
+# ============================================================================
+# 🧰 Tool Configuration
+# ============================================================================
+
+TOOL_CONFIG = {
+    # Threads that run sync tool implementations for async callers
+    'max_workers': int(os.getenv('TOOL_WORKERS', 8)),
+    # Memoized results of tools declared pure or idempotent
+    'cache_enabled': os.getenv('TOOL_CACHE_ENABLED', 'true').lower() == 'true',
+    'cache_file': os.getenv('TOOL_CACHE_FILE', 'tool_cache.json'),
+    'cache_max_entries': int(os.getenv('TOOL_CACHE_MAX_ENTRIES', 512)),
+    'cache_ttl_seconds': int(os.getenv('TOOL_CACHE_TTL', 3600)),  # idempotent tools only
+}
+
+# ============================================================================
+# 🔌 HTTP Connection Pool
+# ============================================================================
+
+HTTP_CONFIG = {
+    'pool_size': int(os.getenv('HTTP_POOL_SIZE', 20)),
+    'keepalive_seconds': float(os.getenv('HTTP_KEEPALIVE_SECONDS', 60)),
+    'http2': os.getenv('HTTP2', 'true').lower() == 'true',
+    'timeout': float(os.getenv('HTTP_TIMEOUT', 120)),
+}
+
+# ============================================================================
+# 🧭 Model Routing
+# ============================================================================
+
+ROUTING_CONFIG = {
+    'enabled': os.getenv('MODEL_ROUTING', 'true').lower() == 'true',
+    # 'static' always uses a route's model; 'latency' picks its fastest healthy candidate
+    'policy': os.getenv('MODEL_ROUTING_POLICY', 'static'),
+    'routes': {
+        'quick': {
+            'model': os.getenv('ROUTE_QUICK_MODEL', GROQ_CONFIG['model']),
+            'max_tokens': 1024,
+            'temperature': 0.2,
+        },
+        'long_form': {
+            'model': os.getenv('ROUTE_LONG_FORM_MODEL', 'llama-3.3-70b-versatile'),
+            'candidates': ['llama-3.3-70b-versatile', GROQ_CONFIG['model']],
+            'max_tokens': 4096,
+            'temperature': 0.7,
+        },
+        'review': {
+            'model': os.getenv('ROUTE_REVIEW_MODEL', 'llama-3.3-70b-versatile'),
+            'candidates': ['llama-3.3-70b-versatile', GROQ_CONFIG['model']],
+            'max_tokens': 2048,
+            'temperature': 0.2,
+        },
+    },
+    # Keys are "agent/task_type", a task type or an agent name
+    'task_routes': {
+        'dev_snippet': 'quick',
+        'doc_outline': 'quick',
+        'doc_section': 'long_form',
+        'doc_consistency': 'long_form',
+        'doc_report': 'long_form',
+        'doc_custom': 'long_form',
+        'readme': 'long_form',
+        'readme_section': 'long_form',
+        'code_review': 'review',
+        'code_review_chunk': 'review',
+        'code_review_unit': 'review',
+        'code_review_diff': 'review',
+    },
+    # Planned max_tokens values are rounded down to one of these, so requests
+    # share a few LLMs (and pooled crews) per route instead of one per budget
+    'max_tokens_buckets': [256, 384, 512, 768, 1024, 1536, 2048, 3072, 4096, 6144, 8192],
+    'latency_smoothing': 0.3,
+    'max_error_streak': 3,
+    'cooldown_seconds': 60,
+}
+
+# ============================================================================
+# 🪁 Request Hedging
+# ============================================================================
+
+HEDGE_CONFIG = {
+    'enabled': os.getenv('HEDGE_REQUESTS', 'false').lower() == 'true',
+    # Send a duplicate once a call is slower than this percentile of its task class
+    'percentile': float(os.getenv('HEDGE_PERCENTILE', 95)),
+    'min_samples': int(os.getenv('HEDGE_MIN_SAMPLES', 20)),
+    'min_delay_seconds': float(os.getenv('HEDGE_MIN_DELAY', 1.0)),
+    # Upper bound on duplicates as a share of all calls
+    'max_hedge_ratio': float(os.getenv('HEDGE_MAX_RATIO', 0.1)),
+}
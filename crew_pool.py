@@ -0,0 +1,83 @@
+# Reusable single-agent crews
+
+import time
+import threading
+from contextlib import contextmanager
+
+
+class CrewPool:
+    """Builds each single-agent crew once and swaps new tasks into it
+
+    Crews are checked out exclusively, so concurrent requests for the same
+    agent get separate crew instances instead of sharing one. An agent runs
+    one task at a time, so only the first crew built for an agent (whatever
+    its verbosity) runs the original and every other crew gets its own copy.
+    Crews for a routed LLM always run a copy of the agent bound to that LLM.
+    """
+
+    def __init__(self, crew_factory):
+        self.crew_factory = crew_factory
+        self.builds = 0
+        self.reuses = 0
+        self.build_seconds = 0.0
+        self.swap_seconds = 0.0
+        self._idle = {}
+        # Agents whose original instance already belongs to a pooled crew
+        self._owned = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, agent, task, verbose=False, llm=None):
+        """Check out a crew for agent with task swapped in, returning it afterwards
+
+        llm, if given, replaces the agent's own LLM for this crew.
+        """
+        key = (id(agent), verbose, id(llm) if llm is not None else None)
+        with self._lock:
+            idle = self._idle.get(key)
+            crew = idle.pop() if idle else None
+            owns_agent = crew is None and llm is None and id(agent) not in self._owned
+            if owns_agent:
+                self._owned.add(id(agent))
+        
+        started = time.perf_counter()
+        if crew is None:
+            crew_agent = agent if owns_agent else self._copy_agent(agent, llm)
+            task.agent = crew_agent
+            crew = self.crew_factory(crew_agent, task, verbose)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.builds += 1
+                self.build_seconds += elapsed
+        else:
+            task.agent = crew.agents[0]
+            crew.tasks = [task]
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.reuses += 1
+                self.swap_seconds += elapsed
+        
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                self._idle.setdefault(key, []).append(crew)
+
+    @staticmethod
+    def _copy_agent(agent, llm=None):
+        """Copy an agent for a crew, keeping the shared (rate-limited) LLM unless one is given"""
+        copied = agent.copy()
+        copied.llm = llm if llm is not None else agent.llm
+        return copied
+
+    def stats(self):
+        """Return build/reuse counters and the construction time saved by reuse"""
+        avg_build = self.build_seconds / self.builds if self.builds else 0.0
+        avg_swap = self.swap_seconds / self.reuses if self.reuses else 0.0
+        return {
+            'builds': self.builds,
+            'reuses': self.reuses,
+            'avg_build_ms': avg_build * 1000,
+            'avg_swap_ms': avg_swap * 1000,
+            'saved_seconds': max(0.0, self.reuses * (avg_build - avg_swap)),
+        }
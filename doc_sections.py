@@ -0,0 +1,66 @@
+# Outline-then-fan-out generation of long documents
+
+import re
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+)[.)]\s+(.+?)\s*$")
+HEADING_LINE = re.compile(r"^#{1,6}\s+")
+
+
+def parse_outline(text, min_sections=3, max_sections=12):
+    """Numbered "N. Section" lines of text as section briefs, or [] if there are too few"""
+    items = [match.group(2) for match in map(NUMBERED_LINE.match, str(text).splitlines()) if match]
+    if len(items) < min_sections:
+        return []
+    return items[:max_sections]
+
+
+def section_title(brief):
+    """Heading text of a section brief such as "How it works - TCP/IP, DNS" """
+    title = re.split(r"\s+[-–—]\s+|:\s+|\s+\(", brief, maxsplit=1)[0]
+    return title.strip(" *#").strip() or brief.strip()
+
+
+def _strip_fences(text):
+    fenced = re.match(r"^```(?:markdown|md)?\s*\n(.*)\n```$", text.strip(), re.DOTALL)
+    return fenced.group(1) if fenced else text
+
+
+def normalize_section(text, heading):
+    """Give a generated section our heading and demote its own headings below it"""
+    lines = _strip_fences(str(text)).strip().splitlines()
+    if lines and HEADING_LINE.match(lines[0]):
+        lines = lines[1:]
+
+    in_code = False
+    body = []
+    for line in lines:
+        if line.lstrip().startswith('```'):
+            in_code = not in_code
+        if not in_code and re.match(r"^#{1,2}\s+", line):
+            line = "###" + line.lstrip('#')
+        body.append(line)
+    return f"{heading}\n\n" + "\n".join(body).strip()
+
+
+def section_opening(text, max_chars=300):
+    """First paragraph of a section's body, for the consistency pass"""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if paragraph and not HEADING_LINE.match(paragraph):
+            return paragraph[:max_chars]
+    return ""
+
+
+def split_framing(text):
+    """Split the consistency pass output into the opening and the closing section"""
+    text = _strip_fences(str(text)).strip()
+    match = re.search(r"^##\s+", text, re.MULTILINE)
+    if match is None:
+        return text, ""
+    return text[:match.start()].strip(), text[match.start():].strip()
+
+
+def stitch_document(opening, sections, closing=""):
+    """Join the opening, sections in outline order and the closing section"""
+    parts = [opening] + list(sections) + [closing]
+    return "\n\n".join(part.strip() for part in parts if part and part.strip()) + "\n"
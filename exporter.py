@@ -0,0 +1,103 @@
+# OpenMetrics (Prometheus) exporter for agent and LLM metrics
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _bound(value):
+    return "+Inf" if value == float('inf') else repr(float(value))
+
+
+def render_openmetrics(recorder, caches=None):
+    """Render recorder and cache statistics in OpenMetrics text format"""
+    snapshot = recorder.snapshot()
+    lines = []
+
+    def family(name, metric_type, help_text):
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"# HELP {name} {help_text}")
+
+    counters = [
+        ('crew_requests', 'requests', "Requests handled, including cache hits"),
+        ('crew_request_errors', 'errors', "Requests that raised an error"),
+        ('crew_cache_hits', 'cache_hits', "Requests served from the response cache"),
+        ('crew_llm_calls', 'llm_calls', "LLM provider calls"),
+        ('crew_llm_errors', 'llm_errors', "Failed LLM provider calls"),
+        ('crew_prompt_tokens', 'prompt_tokens', "Prompt tokens reported by the provider"),
+        ('crew_completion_tokens', 'completion_tokens', "Completion tokens reported by the provider"),
+    ]
+    for name, field, help_text in counters:
+        family(name, 'counter', help_text)
+        for (agent, task_type), summary in sorted(snapshot.items()):
+            lines.append(f"{name}_total{_labels(agent=agent, task_type=task_type)} {summary[field]}")
+
+    histograms = [
+        ('crew_request_latency_seconds', 'latency', "Wall-clock latency of non-cached requests"),
+        ('crew_time_to_first_token_seconds', 'ttft', "Time to the first streamed token"),
+    ]
+    for name, field, help_text in histograms:
+        family(name, 'histogram', help_text)
+        for (agent, task_type), summary in sorted(snapshot.items()):
+            histogram = summary[field]
+            for bound, count in histogram['buckets']:
+                labels = _labels(agent=agent, task_type=task_type, le=_bound(bound))
+                lines.append(f"{name}_bucket{labels} {count}")
+            labels = _labels(agent=agent, task_type=task_type)
+            lines.append(f"{name}_count{labels} {histogram['count']}")
+            lines.append(f"{name}_sum{labels} {histogram['sum']}")
+
+    family('crew_requests_in_flight', 'gauge', "Requests currently running")
+    for (agent, task_type), count in sorted(recorder.in_flight().items()):
+        lines.append(f"crew_requests_in_flight{_labels(agent=agent, task_type=task_type)} {count}")
+
+    if caches:
+        family('crew_cache_lookups', 'counter', "Cache lookups by result")
+        family_entries = []
+        for cache_name, cache in sorted(caches.items()):
+            stats = cache.stats()
+            lines.append(f"crew_cache_lookups_total{_labels(cache=cache_name, result='hit')} {stats['hits']}")
+            lines.append(f"crew_cache_lookups_total{_labels(cache=cache_name, result='miss')} {stats['misses']}")
+            family_entries.append((cache_name, stats))
+        family('crew_cache_hit_ratio', 'gauge', "Cache hit ratio for this process")
+        for cache_name, stats in family_entries:
+            lines.append(f"crew_cache_hit_ratio{_labels(cache=cache_name)} {stats['hit_rate']}")
+        family('crew_cache_entries', 'gauge', "Entries currently held in the cache")
+        for cache_name, stats in family_entries:
+            lines.append(f"crew_cache_entries{_labels(cache=cache_name)} {stats['entries']}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def start_exporter(recorder, caches=None, host='127.0.0.1', port=9464):
+    """Serve /metrics on a daemon thread and return the HTTP server"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_openmetrics(recorder, caches).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True).start()
+    return server
@@ -0,0 +1,41 @@
+# Lazy loading of the crewai framework
+#
+# crewai pulls in litellm and a large dependency graph, so it is only
+# imported when an agent is actually needed (or in the background while
+# the user is still looking at the menu).
+
+import threading
+
+_crewai = None
+_crewai_lock = threading.Lock()
+
+
+def load_crewai():
+    """Import crewai on first use and return the module"""
+    global _crewai
+    if _crewai is None:
+        with _crewai_lock:
+            if _crewai is None:
+                import crewai
+                _crewai = crewai
+    return _crewai
+
+
+def is_crewai_loaded():
+    """Whether crewai has already been imported"""
+    return _crewai is not None
+
+
+def preload_crewai():
+    """Start importing crewai in a background thread"""
+    thread = threading.Thread(target=_preload, name='crewai-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def _preload():
+    try:
+        load_crewai()
+    except Exception:
+        # Surfaced again, with a proper traceback, on first real use
+        pass
@@ -0,0 +1,138 @@
+# Hedged LLM calls to cut tail latency
+#
+# When a call runs longer than a percentile of the latencies observed for
+# its task class, a duplicate is started and whichever answers first wins.
+# Provider calls are blocking and cannot be interrupted, so the losing
+# call is abandoned on its daemon thread and its result discarded.
+
+import time
+import queue
+import threading
+import contextvars
+from config import HEDGE_CONFIG
+from metrics import Histogram, active_request
+from streaming import streaming_active
+
+
+class RequestHedger:
+    """Duplicates slow calls once they pass the task class's latency percentile"""
+
+    def __init__(self, percentile=None, min_samples=None, min_delay_seconds=None,
+                 max_hedge_ratio=None, enabled=None):
+        self.enabled = HEDGE_CONFIG['enabled'] if enabled is None else enabled
+        self.percentile = percentile or HEDGE_CONFIG['percentile']
+        self.min_samples = min_samples or HEDGE_CONFIG['min_samples']
+        self.min_delay_seconds = min_delay_seconds or HEDGE_CONFIG['min_delay_seconds']
+        self.max_hedge_ratio = max_hedge_ratio or HEDGE_CONFIG['max_hedge_ratio']
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def threshold(self, task_class):
+        """Seconds to wait before hedging, or None while there are too few samples"""
+        with self._lock:
+            histogram = self._latencies.get(task_class)
+            if histogram is None or len(histogram.samples) < self.min_samples:
+                return None
+            return max(histogram.percentile(self.percentile), self.min_delay_seconds)
+
+    def _observe(self, task_class, latency):
+        with self._lock:
+            self._latencies.setdefault(task_class, Histogram(max_samples=500)).observe(latency)
+
+    def _within_budget(self):
+        """Keep duplicates to a bounded share of all calls"""
+        with self._lock:
+            return self.hedges < self.max_hedge_ratio * max(self.calls, 1)
+
+    def run(self, call, task_class):
+        """Run call, starting one duplicate if it is slower than the threshold
+
+        Only the primary attempt's latency is observed, once it finishes, even
+        if the duplicate answered first: observing the winner would pull the
+        threshold down towards the hedged calls.
+        """
+        with self._lock:
+            self.calls += 1
+        delay = self.threshold(task_class)
+        # Streamed calls are not hedged: both attempts would write to the same sink
+        if delay is None or streaming_active() or not self._within_budget():
+            return self._timed(call, task_class)
+
+        outcomes = queue.Queue()
+        started_at = time.monotonic()
+
+        def attempt(index):
+            try:
+                result = call()
+            except Exception as e:
+                outcomes.put((index, False, e))
+                return
+            if index == 0:
+                self._observe(task_class, time.monotonic() - started_at)
+            outcomes.put((index, True, result))
+
+        def start(index):
+            # Each attempt gets its own context copy so both can run at once
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(attempt, index),
+                             name=f'llm-hedge-{index}', daemon=True).start()
+
+        start(0)
+        attempts = 1
+        try:
+            outcome = outcomes.get(timeout=delay)
+        except queue.Empty:
+            with self._lock:
+                self.hedges += 1
+            start(1)
+            attempts = 2
+            outcome = outcomes.get()
+
+        # Fall back to the other attempt if the first to finish failed
+        if not outcome[1] and attempts == 2:
+            outcome = outcomes.get()
+
+        index, ok, value = outcome
+        if not ok:
+            raise value
+        if index == 1:
+            with self._lock:
+                self.hedge_wins += 1
+        return value
+
+    def _timed(self, call, task_class):
+        started_at = time.monotonic()
+        result = call()
+        self._observe(task_class, time.monotonic() - started_at)
+        return result
+
+    def wrap(self, llm):
+        """Hedge every call of a crewai LLM by the task class of the active request"""
+        if not self.enabled:
+            return llm
+        call = llm.call
+
+        def hedged_call(*args, **kwargs):
+            request = active_request()
+            task_class = request.task_type if request is not None else 'general'
+            return self.run(lambda: call(*args, **kwargs), task_class)
+
+        # crewai LLMs are pydantic models, which reject assigning undeclared attributes
+        object.__setattr__(llm, 'call', hedged_call)
+        return llm
+
+    def stats(self):
+        """Calls, duplicates sent and duplicates that answered first"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedge_rate': self.hedges / self.calls if self.calls else 0.0,
+                'thresholds': {task_class: histogram.percentile(self.percentile)
+                               for task_class, histogram in self._latencies.items()
+                               if len(histogram.samples) >= self.min_samples},
+            }
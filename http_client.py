@@ -0,0 +1,104 @@
+# Shared keep-alive HTTP connection pool for LLM provider calls
+
+import threading
+from config import HTTP_CONFIG
+
+
+def http2_available():
+    """True when the optional h2 package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ConnectionStats:
+    """Counts requests, new connections and TLS handshakes from httpcore trace events"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def trace(self, event_name, info):
+        if event_name.endswith('send_request_headers.started'):
+            with self._lock:
+                self.requests += 1
+        elif event_name == 'connection.connect_tcp.complete':
+            with self._lock:
+                self.connections += 1
+        elif event_name == 'connection.start_tls.complete':
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(self.requests - self.connections, 0)
+            return {
+                'requests': self.requests,
+                'connections': self.connections,
+                'tls_handshakes': self.tls_handshakes,
+                'reused': reused,
+                'reuse_rate': reused / self.requests if self.requests else 0.0,
+            }
+
+
+class SharedHTTPClient:
+    """One pooled httpx client shared by every LLM instance in the process"""
+
+    def __init__(self, pool_size=None, keepalive_seconds=None, http2=None, timeout=None):
+        self.pool_size = pool_size or HTTP_CONFIG['pool_size']
+        self.keepalive_seconds = keepalive_seconds or HTTP_CONFIG['keepalive_seconds']
+        self.http2 = (HTTP_CONFIG['http2'] if http2 is None else http2) and http2_available()
+        self.timeout = timeout or HTTP_CONFIG['timeout']
+        self.connection_stats = ConnectionStats()
+        self._client = None
+        self._handler = None
+        self._lock = threading.Lock()
+
+    def _attach_trace(self, request):
+        request.extensions['trace'] = self.connection_stats.trace
+
+    @property
+    def client(self):
+        """The pooled httpx.Client, created on first use"""
+        with self._lock:
+            if self._client is None:
+                import httpx
+                self._client = httpx.Client(
+                    http2=self.http2,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                        keepalive_expiry=self.keepalive_seconds
+                    ),
+                    event_hooks={'request': [self._attach_trace]}
+                )
+            return self._client
+
+    def litellm_handler(self):
+        """litellm HTTP handler backed by the shared pool, for LLM(client=...)"""
+        client = self.client
+        with self._lock:
+            if self._handler is None:
+                from litellm.llms.custom_httpx.http_handler import HTTPHandler
+                self._handler = HTTPHandler(client=client)
+            return self._handler
+
+    def close(self):
+        """Close pooled connections"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._handler = None
+
+    def stats(self):
+        """Connection reuse counters plus the pool configuration"""
+        stats = self.connection_stats.snapshot()
+        stats.update({'pool_size': self.pool_size, 'http2': self.http2})
+        return stats
@@ -4,16 +4,52 @@
 Learn agentic AI with free tools and services
 """
 
-from crewai import Agent, Task, Crew, LLM
 import os
 import sys
+import asyncio
 import logging
+import argparse
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from config import (
     AGENT_CONFIG, UI_CONFIG, FILE_CONFIG, PERFORMANCE_CONFIG,
-    GROQ_CONFIG, WORKSHOP_CONFIG
+    GROQ_CONFIG, WORKSHOP_CONFIG, BATCH_CONFIG, REVIEW_CONFIG, STREAM_CONFIG, README_CONFIG,
+    DOC_CONFIG
+)
+from utils import format_duration, estimate_tokens
+from cache import ResponseCache, make_cache_key
+from batch import load_jobs, run_batch
+from code_review import (
+    collect_review_files, review_files_parallel, merge_review_reports,
+    review_units_incremental, assemble_unit_reviews, get_git_diff, split_diff_by_file
+)
+from chunking import (
+    chunk_python_source, split_python_units, assemble_chunk_reviews, pack_units, unit_budget
+)
+from streaming import StreamSink, enable_streaming
+from crew_pool import CrewPool
+from framework import load_crewai, preload_crewai
+from agents import AgentRegistry, DEFAULT_AGENT_SPECS
+from metrics import MetricsRecorder, enable_llm_event_metrics
+from metrics_store import MetricsStore
+from exporter import start_exporter
+from ratelimit import RateLimiter
+from http_client import SharedHTTPClient
+from routing import ModelRouter
+from token_budget import TokenBudget, tokenizer_name
+from hedging import RequestHedger
+from compression import CodeCompressor
+from semantic_cache import SemanticCache
+from readme_sections import (
+    split_readme_sections, join_readme_sections, section_label,
+    match_feedback_sections, clean_section_output
+)
+from prompts import PROMPTS
+from doc_sections import (
+    parse_outline, section_title, normalize_section, section_opening,
+    split_framing, stitch_document
 )
-from utils import save_performance_metrics, load_performance_metrics, format_duration
 
 # Application Constants
 APP_NAME = WORKSHOP_CONFIG['title']
@@ -21,8 +57,75 @@ VERSION = "3.0.0"
 MENU_WIDTH = UI_CONFIG['menu_width']
 SEPARATOR_WIDTH = UI_CONFIG['separator_width']
 
-# Performance tracking
-performance_metrics = load_performance_metrics()
+# Performance tracking, persisted to a store shared with other processes
+metrics_store = MetricsStore(
+    PERFORMANCE_CONFIG['metrics_db'],
+    legacy_file=PERFORMANCE_CONFIG['metrics_file'],
+    enabled=PERFORMANCE_CONFIG['save_metrics']
+)
+request_metrics = MetricsRecorder(store=metrics_store if PERFORMANCE_CONFIG['enable_metrics'] else None)
+
+# Response cache for repeated tasks
+response_cache = ResponseCache()
+
+# Request and token buckets shared by every GROQ call in this process
+rate_limiter = RateLimiter()
+
+# Keep-alive connection pool shared by every GROQ call in this process
+http_client = SharedHTTPClient()
+
+# Duplicates slow calls past their task class's latency percentile (opt-in)
+request_hedger = RequestHedger()
+
+
+def build_crew(agent, task, verbose):
+    """Build a single-agent crew for the crew pool"""
+    return load_crewai().Crew(
+        agents=[agent],
+        tasks=[task],
+        verbose=verbose
+    )
+
+
+# Single-agent crews reused across requests
+crew_pool = CrewPool(build_crew)
+
+# Per-function findings cache for incremental code review, written once per review
+unit_review_cache = ResponseCache(
+    cache_file=REVIEW_CONFIG['unit_cache_file'],
+    max_entries=REVIEW_CONFIG['unit_cache_max_entries'],
+    ttl_seconds=REVIEW_CONFIG['unit_cache_ttl_seconds'],
+    enabled=REVIEW_CONFIG['unit_cache_enabled'],
+    autosave=False
+)
+
+# Bounds concurrent review requests across files, chunks and units together
+review_slots = threading.BoundedSemaphore(REVIEW_CONFIG['max_workers'])
+
+# Near-duplicate answers for free-text dev and doc requests
+semantic_cache = SemanticCache()
+
+# Whitespace and literal compression of code sent for review
+code_compressor = CodeCompressor()
+
+
+def start_metrics_exporter():
+    """Serve live metrics on /metrics when the OpenMetrics exporter is enabled"""
+    if not PERFORMANCE_CONFIG['enable_exporter']:
+        return None
+    host, port = PERFORMANCE_CONFIG['exporter_host'], PERFORMANCE_CONFIG['exporter_port']
+    try:
+        server = start_exporter(
+            request_metrics,
+            caches={'response': response_cache, 'review_unit': unit_review_cache,
+                    'semantic': semantic_cache},
+            host=host, port=port
+        )
+    except OSError as e:
+        print(f"[WARNING] Could not start metrics exporter on {host}:{port}: {e}")
+        return None
+    print(f"[INFO] Metrics exporter listening on http://{host}:{port}/metrics")
+    return server
 
 
 def check_api_keys():
@@ -45,20 +148,29 @@ def check_api_keys():
     return True
 
 
-def get_llm_config():
-    """Get GROQ LLM configuration using CrewAI's LLM class"""
+def get_llm_config(model=None, max_tokens=None, temperature=None, observe=None):
+    """Get GROQ LLM configuration using CrewAI's LLM class
+    
+    observe, if given, is applied to the bare LLM before rate limiting wraps it.
+    """
     api_key = GROQ_CONFIG.get('api_key')
     if not api_key:
         return None
     
-    return LLM(
-        model=f"groq/{GROQ_CONFIG['model']}",
+    crewai = load_crewai()
+    llm = crewai.LLM(
+        model=f"groq/{model or GROQ_CONFIG['model']}",
         api_key=api_key,
-        temperature=GROQ_CONFIG['temperature'],
-        max_tokens=GROQ_CONFIG['max_tokens'],
+        base_url=GROQ_CONFIG['base_url'],
+        temperature=GROQ_CONFIG['temperature'] if temperature is None else temperature,
+        max_tokens=max_tokens or GROQ_CONFIG['max_tokens'],
         top_p=GROQ_CONFIG['top_p'],
-        stream=GROQ_CONFIG['stream']
+        stream=GROQ_CONFIG['stream'],
+        client=http_client.litellm_handler()
     )
+    if observe is not None:
+        observe(llm)
+    return request_hedger.wrap(rate_limiter.wrap(llm))
 
 
 def setup_logging():
@@ -96,94 +208,218 @@ def setup_logging():
 logger = setup_logging()
 
 # Global variables for lazy initialization
-groq_client = None
 llm_config = None
-provider_info = None
-dev_agent = None
-doc_agent = None
-readme_agent = None
-code_reviewer = None
+provider_info = f"(GROQ - {GROQ_CONFIG['model']})" if GROQ_CONFIG.get('api_key') else "(No LLM configured)"
+
+
+def get_llm():
+    """Create the shared GROQ LLM the first time an agent needs it"""
+    global llm_config
+    
+    if llm_config is None:
+        llm_config = get_llm_config()
+        
+        if not llm_config:
+            print("\n[ERROR] GROQ API key not configured!")
+            print("Please add GROQ_API_KEY to .env file")
+            sys.exit(1)
+    
+    return llm_config
+
+
+# Agents are declared here and only built (with their memory) on first use
+agent_registry = AgentRegistry(get_llm, DEFAULT_AGENT_SPECS)
+
 
+def get_agent(name):
+    """Get a registered agent, building it on first use"""
+    return agent_registry.get(name)
 
-def initialize_agents():
-    """Initialize all agents lazily on first use"""
-    global groq_client, llm_config, provider_info, dev_agent, doc_agent, readme_agent, code_reviewer
+
+# Per task class models, each LLM built on first use
+model_router = ModelRouter(get_llm_config)
+
+# Pre-flight prompt estimates and per-task max_tokens
+token_budget = TokenBudget()
+
+
+def prompt_tools(agent):
+    """Tools crewai lists in an agent's prompt, including the memory tools of memory agents"""
+    tools = list(agent.tools or [])
+    if getattr(agent, 'memory', None):
+        from crewai.tools.memory_tools import create_memory_tools
+        tools.extend(create_memory_tools(agent.memory))
+    return tools
+
+
+def resolve_route(agent, task, task_type):
+    """Routed model profile, LLM and estimated prompt tokens for a request
     
-    if dev_agent is not None:
-        return  # Already initialized
+    The prompt is checked against the model's context window before any call
+    is made, and routed requests get max_tokens sized to their task type.
+    Profile and LLM are None when the agent's own LLM is used.
+    """
+    profile = model_router.resolve(agent_registry.name_of(agent), task_type)
+    model = profile['model'] if profile is not None else GROQ_CONFIG['model']
+    default_max_tokens = profile['max_tokens'] if profile is not None else GROQ_CONFIG['max_tokens']
+    prompt_tokens = token_budget.estimate_prompt(agent, task, prompt_tools(agent))
+    max_tokens = token_budget.plan(model, task_type, prompt_tokens, default_max_tokens)
+    if getattr(agent, 'memory', None):
+        # crewai's memory extraction runs on the agent's own (shared GROQ) LLM after the task
+        token_budget.check(GROQ_CONFIG['model'], token_budget.estimate_memory_prompt(agent, task, max_tokens))
+    if profile is None:
+        return None, None, prompt_tokens
     
-    llm_config = get_llm_config()
+    profile = dict(profile, max_tokens=model_router.max_tokens_bucket(max_tokens))
+    logger.info(f"Routing {task_type} for {agent.role} to {profile['model']} ({profile['route']}), "
+                f"~{prompt_tokens} prompt tokens, max_tokens {profile['max_tokens']}")
+    return profile, model_router.llm_for(profile), prompt_tokens
+
+
+def record_token_usage(task_type, estimated_prompt_tokens, request):
+    """Log the estimated prompt size of a finished request against its first task call
     
-    if not llm_config:
-        provider_info = "(No LLM configured)"
-        print("\n[ERROR] GROQ API key not configured!")
-        print("Please add GROQ_API_KEY to .env file")
-        sys.exit(1)
+    Memory extraction calls are left out: they send a different prompt.
+    """
+    if request.cached or not request.task_prompt_tokens:
+        return
+    token_budget.record(task_type, estimated_prompt_tokens, request.task_prompt_tokens)
+    logger.info(f"Tokens for {task_type}: estimated {estimated_prompt_tokens} prompt, "
+                f"actual {request.task_prompt_tokens} in the first task call; "
+                f"{request.llm_calls} calls ({request.memory_calls} for memory) used "
+                f"{request.prompt_tokens} prompt / {request.completion_tokens} completion tokens")
+
+
+def get_cache_key(agent, task, profile=None):
+    """Build the response cache key for an agent/task pair"""
+    if profile is not None:
+        model, temperature = profile['primary_model'], profile['temperature']
+    else:
+        model, temperature = GROQ_CONFIG['model'], GROQ_CONFIG['temperature']
+    return make_cache_key(model, temperature, agent.role, task.description, task.expected_output)
+
+
+def create_stream_sink(label, echo=None, stream_dir=None):
+    """Create a sink that streams tokens to the terminal and a transcript file"""
+    if not STREAM_CONFIG['enabled']:
+        return None
+    enable_streaming()
     
-    provider_info = f"(GROQ - {GROQ_CONFIG['model']})"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    output_file = os.path.join(stream_dir or STREAM_CONFIG['stream_dir'], f"{label}_{timestamp}.md")
+    return StreamSink(echo=STREAM_CONFIG['echo'] if echo is None else echo, output_file=output_file)
+
+
+def show_result(result, stream_sink=None):
+    """Print a result unless it was already streamed to the terminal"""
+    if stream_sink is not None and stream_sink.chunk_count and stream_sink.echo:
+        print(f"[STATS] Time to first token: {stream_sink.ttft:.2f}s")
+        print(f"[FILE] Streamed output saved to: {stream_sink.output_file}")
+    else:
+        print(result)
+
+
+def get_cached_response(agent, task, request, use_cache, profile=None):
+    """Look up a cached response, marking the tracked request as a cache hit"""
+    if not use_cache:
+        return None
     
-    dev_agent = Agent(
-        role="Python Developer",
-        goal="Write clean Python code for any problem",
-        backstory="An expert Python programmer who follows best practices.",
-        verbose=True,
-        llm=llm_config
-    )
+    cached = response_cache.get(get_cache_key(agent, task, profile))
+    if cached is not None:
+        request.cached = True
+        logger.info(f"Response cache hit for {agent.role}")
+    return cached
 
-    doc_agent = Agent(
-        role="Technical Documentation Expert",
-        goal="Create well-structured, comprehensive, and highly informative documentation with clear explanations, examples, and proper formatting",
-        backstory="An expert technical writer with 10+ years of experience creating clear, concise documentation. You excel at breaking down complex topics into digestible sections with examples, use cases, and practical applications. You structure documentation with clear headings, bullet points, and logical flow.",
-        verbose=True,
-        llm=llm_config,
-        max_iter=5
-    )
 
-    readme_agent = Agent(
-        role="README Generator",
-        goal="Create professional, detailed, and emojified README.md files from natural language project descriptions",
-        backstory="An expert technical writer and project analyst who excels at understanding complex project contexts and transforming them into comprehensive, professional README files.",
-        verbose=True,
-        max_iter=10,
-        memory=True,
-        llm=llm_config
-    )
+def run_crew(agent, task, verbose=False, use_cache=True, stream_sink=None, task_type='general'):
+    """Run a single-agent crew, serving repeated requests from the response cache"""
+    with request_metrics.track(agent.role, task_type) as request:
+        # Inside the tracked block so rejected prompts count as request errors
+        profile, llm, prompt_tokens = resolve_route(agent, task, task_type)
+        cached = get_cached_response(agent, task, request, use_cache, profile)
+        if cached is not None:
+            return cached
+        
+        enable_llm_event_metrics()
+        with crew_pool.acquire(agent, task, verbose, llm=llm) as crew:
+            if stream_sink is not None:
+                with stream_sink:
+                    result = crew.kickoff()
+                request.ttft = stream_sink.ttft
+            else:
+                result = crew.kickoff()
+    
+    if request.ttft is not None:
+        logger.info(f"Time to first token for {agent.role}: {request.ttft:.2f}s")
+    record_token_usage(task_type, prompt_tokens, request)
+    response_cache.set(get_cache_key(agent, task, profile), str(result))
+    return result
 
-    code_reviewer = Agent(
-        role="Senior Code Reviewer",
-        goal="Analyze code for bugs, security vulnerabilities, performance issues, and best practices",
-        backstory="A seasoned software engineer with 15+ years of experience in code review, security analysis, and performance optimization.",
-        verbose=True,
-        max_iter=8,
-        memory=True,
-        llm=llm_config
-    )
+
+async def run_crew_async(agent, task, use_cache=True, stream_sink=None, task_type='general'):
+    """Async variant of run_crew built on Crew.kickoff_async"""
+    with request_metrics.track(agent.role, task_type) as request:
+        profile, llm, prompt_tokens = resolve_route(agent, task, task_type)
+        cached = get_cached_response(agent, task, request, use_cache, profile)
+        if cached is not None:
+            return cached
+        
+        enable_llm_event_metrics()
+        with crew_pool.acquire(agent, task, llm=llm) as crew:
+            if stream_sink is not None:
+                with stream_sink:
+                    result = await crew.kickoff_async()
+                request.ttft = stream_sink.ttft
+            else:
+                result = await crew.kickoff_async()
+    
+    record_token_usage(task_type, prompt_tokens, request)
+    response_cache.set(get_cache_key(agent, task, profile), str(result))
+    return result
+
+
+def find_similar_response(request_text, task_type):
+    """Earlier answer to a near-identical free-text request, or None"""
+    match = semantic_cache.get(request_text, namespace=task_type)
+    if match is None:
+        return None
+    print(f"[CACHE] Reusing the answer to a {match['similarity']:.0%} similar earlier request: "
+          f"\"{match['text']}\"")
+    return match['value']
+
+
+def remember_response(request_text, task_type, result):
+    """Keep the answer to a free-text request for near-identical ones"""
+    if result is not None:
+        semantic_cache.set(request_text, str(result), namespace=task_type)
 
 
 def get_dev_task(choice, custom_description=None):
     """Create development tasks based on user choice"""
+    Task = load_crewai().Task
     if choice == 1:
         return Task(
             description="Write a Python function to reverse a string.",
             expected_output="Python code that takes a string and returns it reversed.",
-            agent=dev_agent
+            agent=get_agent('dev_agent')
         )
     elif choice == 2:
         return Task(
             description="Write a Python function to check if a number is a palindrome.",
             expected_output="Python code that takes a number and returns True if it's a palindrome, False otherwise.",
-            agent=dev_agent
+            agent=get_agent('dev_agent')
         )
     elif choice == 3:
         return Task(
             description=custom_description,
             expected_output="Clean, optimized and well-commented Python code that solves the given problem with proper error handling and best practices.",
-            agent=dev_agent
+            agent=get_agent('dev_agent')
         )
 
 
 def get_doc_task(choice, custom_description=None):
     """Create documentation tasks based on user choice"""
+    Task = load_crewai().Task
     if choice == 1:
         return Task(
             description="""Write a comprehensive technical report about computers. Include:
@@ -196,7 +432,7 @@ def get_doc_task(choice, custom_description=None):
 
 Format with clear headings, bullet points, and practical examples. Make it accessible to beginners while being informative.""",
             expected_output="A well-structured, detailed technical report with clear sections, examples, and practical applications. Should be 1000+ words with proper formatting.",
-            agent=doc_agent
+            agent=get_agent('doc_agent')
         )
     elif choice == 2:
         return Task(
@@ -211,7 +447,7 @@ Format with clear headings, bullet points, and practical examples. Make it acces
 
 Format with clear headings, bullet points, and real-world examples. Make it accessible to beginners while being technically accurate.""",
             expected_output="A well-structured, detailed technical report with clear sections, examples, and practical applications. Should be 1000+ words with proper formatting.",
-            agent=doc_agent
+            agent=get_agent('doc_agent')
         )
     elif choice == 3:
         return Task(
@@ -224,10 +460,123 @@ Please structure your response with:
 - Logical flow and organization
 - Comprehensive coverage of the topic""",
             expected_output="A comprehensive, well-structured document with clear sections, examples, and practical applications. Should be detailed and informative.",
-            agent=doc_agent
+            agent=get_agent('doc_agent')
         )
 
 
+def create_outline_task(description):
+    """Create a task that outlines a long document as numbered sections"""
+    return load_crewai().Task(
+        description=f"""Plan the sections of the following document. Do not write the document itself.
+
+DOCUMENT BRIEF:
+{description}
+
+Return ONLY a numbered list of 4 to 8 sections in reading order, one per line, formatted as:
+1. Section title - key points to cover""",
+        expected_output="A numbered list of section titles, each with the key points it should cover.",
+        agent=get_agent('doc_agent')
+    )
+
+
+def create_doc_section_task(description, outline, index, heading):
+    """Create a task that writes one section of an outlined document"""
+    numbered_outline = "\n".join(f"{i}. {brief}" for i, brief in enumerate(outline, 1))
+    return load_crewai().Task(
+        description=f"""You are writing ONE section of a larger document; the other sections are written separately.
+
+DOCUMENT BRIEF:
+{description}
+
+OUTLINE:
+{numbered_outline}
+
+WRITE SECTION {index + 1}: {outline[index]}
+
+Cover only this section. Do not repeat other sections or add an introduction or conclusion for the whole document.
+Use clear subheadings, bullet points and practical examples, in about 200-400 words.
+Start with the heading "{heading}".""",
+        expected_output=f"The complete '{section_title(outline[index])}' section in markdown.",
+        agent=get_agent('doc_agent')
+    )
+
+
+def create_doc_framing_task(description, sections):
+    """Create the consistency pass that writes the title, introduction and conclusion"""
+    openings = "\n\n".join(
+        f"{section.splitlines()[0]}\n{section_opening(section)}" for section in sections
+    )
+    return load_crewai().Task(
+        description=f"""The sections below were written separately for one document. Write the parts that tie them together.
+
+DOCUMENT BRIEF:
+{description}
+
+SECTIONS (heading and opening paragraph of each):
+{openings}
+
+Return, in markdown:
+1. A "# " title line followed by a short introduction that previews the sections in order.
+2. A "## Conclusion" section summarizing the key takeaways.
+Do not rewrite the sections themselves.""",
+        expected_output="A title with an introduction paragraph, followed by a '## Conclusion' section.",
+        agent=get_agent('doc_agent')
+    )
+
+
+def generate_document(description, use_cache=True):
+    """Outline a document, write its sections concurrently and stitch them in order
+
+    Returns None when no usable outline could be produced.
+    """
+    outline = parse_outline(description)
+    if not outline:
+        outline_result = run_crew(get_agent('doc_agent'), create_outline_task(description),
+                                  use_cache=use_cache, task_type='doc_outline')
+        outline = parse_outline(outline_result)
+    if not outline:
+        return None
+    
+    headings = [f"## {i}. {section_title(brief)}" for i, brief in enumerate(outline, 1)]
+    print(f"[INFO] Writing {len(outline)} sections in parallel: "
+          f"{', '.join(section_title(brief) for brief in outline)}")
+    
+    def write_section(index):
+        task = create_doc_section_task(description, outline, index, headings[index])
+        result = run_crew(get_agent('doc_agent'), task, use_cache=use_cache, task_type='doc_section')
+        return normalize_section(result, headings[index])
+    
+    workers = max(1, min(DOC_CONFIG['section_workers'], len(outline)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        sections = list(pool.map(write_section, range(len(outline))))
+    
+    framing = run_crew(get_agent('doc_agent'), create_doc_framing_task(description, sections),
+                       use_cache=use_cache, task_type='doc_consistency')
+    opening, closing = split_framing(framing)
+    return stitch_document(opening, sections, closing)
+
+
+def run_doc_task(task, task_type):
+    """Run a documentation task, fanning long documents out section by section"""
+    if DOC_CONFIG['fan_out']:
+        print(f"\n[START] Outlining the document and writing its sections...")
+        result = generate_document(task.description)
+        if result is not None:
+            print("\n[OK] Final Output:")
+            print(result)
+            return result
+        print("[WARNING] Could not outline the document, generating it in one pass")
+    
+    stream_sink = create_stream_sink('doc_agent')
+    
+    print(f"\n[START] Starting task execution...")
+    result = run_crew(get_agent('doc_agent'), task, verbose=True, stream_sink=stream_sink,
+                      task_type=task_type)
+    print("\n[OK] Final Output:")
+    show_result(result, stream_sink)
+    return result
+
+
 def get_project_context():
     """Get comprehensive natural language project context from user"""
     print("\n[DOC] Welcome to the Enhanced Professional README Generator!")
@@ -278,50 +627,77 @@ def get_project_context():
 
 def create_readme_task(project_context, improvement_feedback=None):
     """Create README generation task from natural language context"""
-    base_description = f"""
-    Based on the following comprehensive project context, create a professional, detailed, and emojified README.md file:
-    
-    PROJECT CONTEXT: 
-    {project_context}
-    
-    CREATE A COMPREHENSIVE README WITH:
-    1. [TARGET] Attractive title with relevant emojis and tagline
-    2. [STATS] Professional badges (GitHub, build status, version, license, etc.)
-    3.  Clear and compelling project description
-    4.  Comprehensive features list with emojis
-    5.  Complete technology stack section
-    6.  Detailed prerequisites and system requirements
-    7. [START] Step-by-step installation instructions
-    8. [TIP] Usage examples with realistic code snippets
-    9. [FILE] Project structure/architecture overview
-    10.  Configuration options and environment variables
-    11.  Testing instructions
-    12.  API documentation (if applicable)
-    13.  Contributing guidelines
-    14. [DOC] License information
-    15.  Authors/contributors section
-    16.  Support and contact information
-    
-    QUALITY STANDARDS:
-    - Use professional markdown formatting
-    - Include appropriate emojis for visual appeal
-    - Ensure all code blocks have proper syntax highlighting
-    - Create realistic and functional examples
-    - Make it comprehensive yet readable
-    - Follow modern README best practices
-    """
-    
-    if improvement_feedback:
-        base_description += f"\n\nIMPROVEMENT REQUEST: {improvement_feedback}"
-        base_description += "\nPlease address the feedback and improve the README accordingly."
+    improvement_request = f"\nIMPROVEMENT REQUEST: {improvement_feedback}" if improvement_feedback else ""
+    base_description = PROMPTS.render('readme', project_context=project_context,
+                                      improvement_request=improvement_request)
     
-    return Task(
+    return load_crewai().Task(
         description=base_description,
         expected_output="A complete, professional, and comprehensive README.md file with proper markdown formatting, emojis, and all requested improvements.",
-        agent=readme_agent
+        agent=get_agent('readme_agent')
+    )
+
+
+def create_readme_section_task(project_context, sections, index, feedback):
+    """Create a task that rewrites one README section to address feedback"""
+    section = sections[index]
+    outline = "\n".join(f"- {section_label(s)}" for s in sections)
+    start = f'its heading line "{section["heading"]}"' if section['heading'] else "the README title line"
+    
+    description = PROMPTS.render(
+        'readme_section', project_context=project_context, outline=outline,
+        label=section_label(section), section=section['text'], feedback=feedback, start=start
+    )
+    
+    return load_crewai().Task(
+        description=description,
+        expected_output=f"The rewritten {section_label(section)} section of the README in markdown.",
+        agent=get_agent('readme_agent')
     )
 
 
+def choose_readme_sections(feedback, sections):
+    """Map feedback to README sections, letting the user adjust the selection"""
+    matched = match_feedback_sections(feedback, sections)
+    
+    print("\n[DOC] README sections:")
+    for index, section in enumerate(sections, 1):
+        marker = "*" if index - 1 in matched else " "
+        print(f" {marker} {index}. {section_label(section)}")
+    
+    if matched:
+        prompt = "Sections marked * will be regenerated. Press Enter to accept, or type section numbers (e.g. 2,5) or 'all': "
+    else:
+        prompt = "Which sections should change? Type section numbers (e.g. 2,5) or press Enter for all: "
+    choice = input(prompt).strip().lower()
+    
+    if choice == 'all' or (not choice and not matched):
+        return list(range(len(sections)))
+    if not choice:
+        return matched
+    
+    selected = []
+    for part in choice.replace(' ', ',').split(','):
+        if part.isdigit() and 1 <= int(part) <= len(sections):
+            selected.append(int(part) - 1)
+    return sorted(set(selected)) or matched or list(range(len(sections)))
+
+
+def regenerate_readme_sections(project_context, sections, indices, feedback):
+    """Regenerate the selected sections concurrently and splice them back in order"""
+    def regenerate(index):
+        task = create_readme_section_task(project_context, sections, index, feedback)
+        result = run_crew(get_agent('readme_agent'), task, task_type='readme_section')
+        return clean_section_output(result, sections[index])
+    
+    updated = [dict(section) for section in sections]
+    workers = max(1, min(README_CONFIG['section_workers'], len(indices)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for index, text in zip(indices, pool.map(regenerate, indices)):
+            updated[index]['text'] = text
+    return updated
+
+
 def get_save_location():
     """Get save location from user"""
     print("\n Where would you like to save the README.md file?")
@@ -357,17 +733,23 @@ def get_save_location():
 
 
 def get_code_review_input():
-    """Get code for review with multiple input methods"""
+    """Get code for review with multiple input methods
+    
+    Returns the code text, a list of file paths for directory/glob reviews,
+    or a dict of per-file diffs for git diff reviews.
+    """
     print("\n[SEARCH] Welcome to the Code Review Agent!")
     print("="*60)
     print("Choose how you want to provide code for review:")
     print("1. [FILE] Review a specific file")
     print("2. [NOTE] Paste code directly")
-    print("3.  Back to Main Menu")
+    print("3. [DIR] Review a directory or glob pattern")
+    print("4. [DIFF] Review changes from git diff")
+    print("5.  Back to Main Menu")
     print("="*60)
     
     try:
-        choice = int(input("\nEnter your choice (1, 2, or 3): "))
+        choice = int(input("\nEnter your choice (1, 2, 3, 4, or 5): "))
         
         if choice == 1:
             file_path = input("\n[FILE] Enter the file path to review: ").strip()
@@ -416,9 +798,39 @@ def get_code_review_input():
             return code_content, "Direct input"
             
         elif choice == 3:
+            target = input("\n[DIR] Enter a directory or glob (e.g. src/**/*.py): ").strip()
+            if not target:
+                print("[ERROR] Directory or pattern cannot be empty!")
+                return None, None
+            
+            review_paths = collect_review_files(target)
+            if not review_paths:
+                print(f"[ERROR] No source files found for: {target}")
+                return None, None
+            
+            print(f"[STATS] Found {len(review_paths)} files to review")
+            return review_paths, f"Directory: {target}"
+            
+        elif choice == 4:
+            revision = input("\n[DIFF] Compare against revision (default: HEAD): ").strip() or "HEAD"
+            
+            try:
+                file_diffs = split_diff_by_file(get_git_diff(revision))
+            except Exception as e:
+                print(f"[ERROR] Could not run git diff: {e}")
+                return None, None
+            
+            if not file_diffs:
+                print(f"[ERROR] No changes found against: {revision}")
+                return None, None
+            
+            print(f"[STATS] Found changes in {len(file_diffs)} files")
+            return file_diffs, f"Git diff: {revision}"
+            
+        elif choice == 5:
             return None, None
         else:
-            print("[ERROR] Invalid choice! Please select 1, 2, or 3.")
+            print("[ERROR] Invalid choice! Please select 1, 2, 3, 4, or 5.")
             return None, None
             
     except ValueError:
@@ -426,55 +838,156 @@ def get_code_review_input():
         return None, None
 
 
-def create_code_review_task(code_content, code_source):
-    """Create comprehensive code review task"""
-    return Task(
-        description=f"""
-        Perform a comprehensive code review of the following code from {code_source}:
-        
-        CODE TO REVIEW:
-        ```
-        {code_content}
-        ```
-        
-        REVIEW REQUIREMENTS:
-        
-        1.  BUG DETECTION:
-           - Identify potential runtime errors
-           - Check for logical errors
-           - Find edge cases that might cause issues
-        
-        2.  SECURITY ANALYSIS:
-           - Check for security vulnerabilities
-           - Identify potential injection attacks
-           - Review input validation
-        
-        3.  PERFORMANCE REVIEW:
-           - Identify performance bottlenecks
-           - Check algorithm efficiency
-           - Suggest optimization opportunities
-        
-        4.  CODE QUALITY:
-           - Check adherence to coding standards
-           - Review naming conventions
-           - Assess code readability
-        
-        5.  ARCHITECTURE & DESIGN:
-           - Review design patterns usage
-           - Check SOLID principles adherence
-           - Assess code structure
-        
-        PROVIDE ACTIONABLE RECOMMENDATIONS:
-        - Specific feedback where applicable
-        - Code examples for suggested improvements
-        - Priority levels (Critical, High, Medium, Low)
-        - Rate overall code quality (1-10)
-        """,
+def create_code_review_task(code_content, code_source, shared_context=None, diff=False, unit_names=None):
+    """Create comprehensive code review task
+    
+    unit_names, if given, asks for a '### <name>' section per unit so the
+    findings can be stored per unit.
+    """
+    code_content, saved_tokens = code_compressor.compress(code_content, diff=diff)
+    if saved_tokens:
+        print(f"[STATS] Compressed review input for {code_source}: ~{saved_tokens} tokens saved")
+    
+    context_block = ""
+    if shared_context:
+        context_block = f"\nSHARED CONTEXT (reference only - do not review):\n```\n{shared_context}\n```\n"
+    
+    unit_headings = ""
+    if unit_names:
+        unit_headings = ("REPORT LAYOUT: give each of these units its own '### <unit name>' heading with "
+                         "its findings, in this order: " + ", ".join(unit_names))
+    
+    return load_crewai().Task(
+        description=PROMPTS.render('code_review', code_source=code_source, shared_context=context_block,
+                                   code=code_content, unit_headings=unit_headings),
         expected_output="A comprehensive code review report with detailed analysis, specific recommendations, and actionable improvements.",
-        agent=code_reviewer
+        agent=get_agent('code_reviewer')
     )
 
 
+def run_review(task, task_type, stream_sink=None):
+    """Run a code review request once one of the shared review slots is free
+    
+    Files, chunks and units are reviewed on nested pools; the slots keep the
+    number of review requests in flight at REVIEW_MAX_WORKERS overall.
+    """
+    with review_slots:
+        return run_crew(get_agent('code_reviewer'), task, stream_sink=stream_sink, task_type=task_type)
+
+
+def unit_review_salt():
+    """Everything besides a unit's code that shapes its findings"""
+    model = (model_router.route_model('code_reviewer', 'code_review_unit')
+             or GROQ_CONFIG['model'])
+    template = PROMPTS.templates['code_review']
+    return "|".join([model, template.prefix_hash, template.payload, code_compressor.settings_key()])
+
+
+def review_code_incremental(code_content, header, units, code_source, stream_sink=None):
+    """Review only the functions and classes that changed since their last review
+    
+    Changed units are packed into requests of up to REVIEW_CHUNK_MAX_TOKENS.
+    When nothing is stored yet and the whole file fits, it is sent as one
+    (streamed) request.
+    """
+    budget = unit_budget(header)
+    
+    def review_batch(batch):
+        names = [unit['name'] for unit in batch]
+        if len(batch) == len(units) and estimate_tokens(code_content) <= REVIEW_CONFIG['chunk_max_tokens']:
+            task = create_code_review_task(code_content, code_source, unit_names=names)
+            return run_review(task, 'code_review', stream_sink=stream_sink)
+        batch_source = f"{code_source} ({', '.join(names)}, lines {batch[0]['start']}-{batch[-1]['end']})"
+        task = create_code_review_task("\n\n".join(unit['source'] for unit in batch), batch_source,
+                                       shared_context=header, unit_names=names)
+        return run_review(task, 'code_review_unit')
+    
+    reports, reused, batch_reports = review_units_incremental(
+        units, review_batch, lambda pending: pack_units(pending, budget),
+        unit_review_cache, salt=unit_review_salt()
+    )
+    print(f"[STATS] Reviewed {reused.count(False)} changed units in {len(batch_reports)} requests, "
+          f"reused findings for {reused.count(True)}")
+    if len(batch_reports) == 1 and not any(reused):
+        return batch_reports[0][1]
+    return assemble_unit_reviews(units, reports, reused, batch_reports)
+
+
+def review_code(code_content, code_source, stream_sink=None):
+    """Review code, splitting large Python sources into AST-aligned chunks
+    
+    stream_sink is only used when the review fits in a single request.
+    """
+    if REVIEW_CONFIG['incremental']:
+        split = split_python_units(code_content)
+        if split and split[1]:
+            return review_code_incremental(code_content, split[0], split[1], code_source, stream_sink)
+    
+    chunks = None
+    if estimate_tokens(code_content) > REVIEW_CONFIG['chunk_max_tokens']:
+        chunks = chunk_python_source(code_content)
+    
+    if not chunks or len(chunks) == 1:
+        task = create_code_review_task(code_content, code_source)
+        return run_review(task, 'code_review', stream_sink=stream_sink)
+    
+    print(f"[STATS] Large file split into {len(chunks)} chunks for review")
+    
+    def review_chunk(numbered_chunk):
+        index, chunk = numbered_chunk
+        chunk_source = f"{code_source} (part {index}/{len(chunks)}, lines {chunk['start_line']}-{chunk['end_line']})"
+        task = create_code_review_task(chunk['code'], chunk_source, shared_context=chunk['header'])
+        return run_review(task, 'code_review_chunk')
+    
+    with ThreadPoolExecutor(max_workers=REVIEW_CONFIG['max_workers']) as pool:
+        reports = list(pool.map(review_chunk, enumerate(chunks, 1)))
+    
+    return assemble_chunk_reviews(chunks, reports)
+
+
+def review_file(file_path):
+    """Review a single file with the code reviewer agent"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        code_content = f.read()
+    return review_code(code_content, f"File: {file_path}")
+
+
+def review_diff(file_diffs):
+    """Review only the changed hunks of each file in parallel"""
+    def review_file_diff(path):
+        diff_source = f"Git diff of {path} (review the changed lines marked + and -)"
+        task = create_code_review_task(file_diffs[path], diff_source, diff=True)
+        return run_review(task, 'code_review_diff')
+    
+    reports, errors = review_files_parallel(list(file_diffs), review_file_diff)
+    return merge_review_reports(reports, errors)
+
+
+def review_repository(review_paths):
+    """Review many files in parallel and merge them into one ranked report"""
+    reports, errors = review_files_parallel(review_paths, review_file)
+    unit_review_cache.flush()
+    return merge_review_reports(reports, errors)
+
+
+def save_code_review(result, code_source):
+    """Save a code review report to a timestamped markdown file"""
+    try:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"code_review_{timestamp}.md"
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"# Code Review Report\n\n")
+            f.write(f"**Source:** {code_source}\n")
+            f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("---\n\n")
+            f.write(str(result))
+        
+        print(f"[OK] Code review saved to: {filename}")
+    except Exception as e:
+        print(f"[ERROR] Error saving review: {e}")
+
+
 def handle_code_review():
     """Handle the code review process"""
     while True:
@@ -490,39 +1003,27 @@ def handle_code_review():
         print(f"\n[SEARCH] Analyzing code from: {code_source}")
         print("[WAIT] Please wait while I perform a comprehensive code review...")
         
-        task = create_code_review_task(code_content, code_source)
-        crew = Crew(
-            agents=[code_reviewer],
-            tasks=[task],
-            verbose=False
-        )
-        
+        stream_sink = None
         try:
-            result = crew.kickoff()
+            if isinstance(code_content, dict):
+                result = review_diff(code_content)
+            elif isinstance(code_content, list):
+                result = review_repository(code_content)
+            else:
+                stream_sink = create_stream_sink('code_review')
+                result = review_code(code_content, code_source, stream_sink=stream_sink)
+                unit_review_cache.flush()
             
             print("\n" + "="*80)
             print("[SEARCH] CODE REVIEW REPORT")
             print("="*80)
-            print(result)
+            show_result(result, stream_sink)
             print("="*80)
             
             save_choice = input("\n Would you like to save this review to a file? (Y/N): ").strip().upper()
             
             if save_choice == 'Y':
-                try:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"code_review_{timestamp}.md"
-                    
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(f"# Code Review Report\n\n")
-                        f.write(f"**Source:** {code_source}\n")
-                        f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                        f.write("---\n\n")
-                        f.write(str(result))
-                    
-                    print(f"[OK] Code review saved to: {filename}")
-                except Exception as e:
-                    print(f"[ERROR] Error saving review: {e}")
+                save_code_review(result, code_source)
             
             continue_choice = input("\n[RETRY] Would you like to review more code? (Y/N): ").strip().upper()
             if continue_choice != 'Y':
@@ -541,25 +1042,47 @@ def handle_readme_generation():
     if not project_context:
         return
     
+    result = None
+    sections = None
+    feedback = None
+    
     while True:
-        print("\n[START] Generating comprehensive professional README...")
-        print("[WAIT] Please wait while I analyze your project context...")
-        
-        task = create_readme_task(project_context)
-        crew = Crew(
-            agents=[readme_agent],
-            tasks=[task],
-            verbose=False
-        )
-        
         try:
-            result = crew.kickoff()
-            
-            print("\n" + "="*80)
-            print("[DOC] GENERATED README.md")
-            print("="*80)
-            print(result)
-            print("="*80)
+            if result is None:
+                print("\n[START] Generating comprehensive professional README...")
+                print("[WAIT] Please wait while I analyze your project context...")
+                
+                task = create_readme_task(project_context)
+                stream_sink = create_stream_sink('readme')
+                
+                print("\n" + "="*80)
+                print("[DOC] GENERATED README.md")
+                print("="*80)
+                
+                result = run_crew(get_agent('readme_agent'), task, stream_sink=stream_sink, task_type='readme')
+                show_result(result, stream_sink)
+                print("="*80)
+                
+                # Later feedback only regenerates the sections it is about
+                sections = split_readme_sections(result)
+                if len(sections) < 2:
+                    sections = None
+            elif feedback:
+                indices = choose_readme_sections(feedback, sections)
+                names = ", ".join(section_label(sections[i]) for i in indices)
+                print(f"\n[RETRY] Regenerating {len(indices)} of {len(sections)} sections: {names}")
+                
+                section_start = datetime.now()
+                sections = regenerate_readme_sections(project_context, sections, indices, feedback)
+                result = join_readme_sections(sections)
+                
+                print("\n" + "="*80)
+                print("[DOC] UPDATED README.md")
+                print("="*80)
+                print(result)
+                print("="*80)
+                print(f"[STATS] Sections regenerated in {format_duration(datetime.now() - section_start)}")
+                feedback = None
             
             print("\n Are you satisfied with this README?")
             satisfaction = input("Type 'Y' if satisfied, or provide feedback for improvements: ").strip()
@@ -582,8 +1105,12 @@ def handle_readme_generation():
                     continue
                     
             elif satisfaction:
-                print(f"\n[RETRY] Regenerating README with your feedback...")
-                project_context += f"\n\nADDITIONAL REQUIREMENTS: {satisfaction}"
+                if sections is None:
+                    print(f"\n[RETRY] Regenerating README with your feedback...")
+                    project_context += f"\n\nADDITIONAL REQUIREMENTS: {satisfaction}"
+                    result = None
+                else:
+                    feedback = satisfaction
                 continue
             else:
                 print("[ERROR] Please provide feedback or type 'Y' if satisfied.")
@@ -607,7 +1134,7 @@ def show_help():
     print("\n[TIP] Tips:")
     print("• Use Dev Agent → Code Review for best workflow")
     print("• README Generator supports multi-line input")
-    print("• Code Review can analyze files or pasted code")
+    print("• Code Review can analyze files, pasted code or whole directories")
     print("• All outputs can be saved to files")
     print("="*MENU_WIDTH)
 
@@ -645,16 +1172,14 @@ def handle_dev_agent():
                 break
             elif task_choice in [1, 2]:
                 task = get_dev_task(task_choice)
-                crew = Crew(
-                    agents=[dev_agent],
-                    tasks=[task],
-                    verbose=True
-                )
+                
+                stream_sink = create_stream_sink('dev_agent')
                 
                 print(f"\n[START] Starting task execution...")
-                result = crew.kickoff()
+                result = run_crew(get_agent('dev_agent'), task, verbose=True, stream_sink=stream_sink,
+                                  task_type='dev_snippet')
                 print("\n[OK] Final Output:")
-                print(result)
+                show_result(result, stream_sink)
                 
                 input("\n[NOTE] Press Enter to continue...")
                 
@@ -662,17 +1187,21 @@ def handle_dev_agent():
                 print("\n Custom Task Selected!")
                 custom_task = input("Enter your custom task in natural language: ")
                 if custom_task.strip():
-                    task = get_dev_task(3, custom_task)
-                    crew = Crew(
-                        agents=[dev_agent],
-                        tasks=[task],
-                        verbose=True
-                    )
-                    
-                    print(f"\n[START] Starting task execution...")
-                    result = crew.kickoff()
-                    print("\n[OK] Final Output:")
-                    print(result)
+                    result = find_similar_response(custom_task, 'dev_custom')
+                    if result is not None:
+                        print("\n[OK] Final Output:")
+                        print(result)
+                    else:
+                        task = get_dev_task(3, custom_task)
+                        
+                        stream_sink = create_stream_sink('dev_agent')
+                        
+                        print(f"\n[START] Starting task execution...")
+                        result = run_crew(get_agent('dev_agent'), task, verbose=True, stream_sink=stream_sink,
+                                          task_type='dev_custom')
+                        print("\n[OK] Final Output:")
+                        show_result(result, stream_sink)
+                        remember_response(custom_task, 'dev_custom', result)
                     
                     input("\n[NOTE] Press Enter to continue...")
                 else:
@@ -704,16 +1233,7 @@ def handle_doc_agent():
                 break
             elif task_choice in [1, 2]:
                 task = get_doc_task(task_choice)
-                crew = Crew(
-                    agents=[doc_agent],
-                    tasks=[task],
-                    verbose=True
-                )
-                
-                print(f"\n[START] Starting task execution...")
-                result = crew.kickoff()
-                print("\n[OK] Final Output:")
-                print(result)
+                run_doc_task(task, 'doc_report')
                 
                 input("\n[NOTE] Press Enter to continue...")
                 
@@ -721,17 +1241,14 @@ def handle_doc_agent():
                 print("\n Custom Documentation Task Selected!")
                 custom_task = input("Enter your custom documentation task in natural language: ")
                 if custom_task.strip():
-                    task = get_doc_task(3, custom_task)
-                    crew = Crew(
-                        agents=[doc_agent],
-                        tasks=[task],
-                        verbose=True
-                    )
-                    
-                    print(f"\n[START] Starting task execution...")
-                    result = crew.kickoff()
-                    print("\n[OK] Final Output:")
-                    print(result)
+                    result = find_similar_response(custom_task, 'doc_custom')
+                    if result is not None:
+                        print("\n[OK] Final Output:")
+                        print(result)
+                    else:
+                        task = get_doc_task(3, custom_task)
+                        result = run_doc_task(task, 'doc_custom')
+                        remember_response(custom_task, 'doc_custom', result)
                     
                     input("\n[NOTE] Press Enter to continue...")
                 else:
@@ -745,19 +1262,217 @@ def handle_doc_agent():
             print(f"[ERROR] An error occurred: {e}")
 
 
+def build_job_task(job):
+    """Build the agent, task and task type for a batch job"""
+    job_type = job['type']
+    
+    if job_type in ('dev', 'doc'):
+        choice = job.get('choice', 3)
+        description = job.get('description')
+        if choice not in (1, 2, 3):
+            raise ValueError("choice must be 1, 2 or 3")
+        if choice == 3 and not description:
+            raise ValueError("custom tasks need a description")
+        
+        if job_type == 'dev':
+            task_type = 'dev_snippet' if choice in (1, 2) else 'dev_custom'
+            return get_agent('dev_agent'), get_dev_task(choice, description), task_type
+        task_type = 'doc_report' if choice in (1, 2) else 'doc_custom'
+        return get_agent('doc_agent'), get_doc_task(choice, description), task_type
+    
+    if job_type == 'readme':
+        if not job.get('context'):
+            raise ValueError("readme jobs need a context")
+        return get_agent('readme_agent'), create_readme_task(job['context'], job.get('feedback')), 'readme'
+    
+    raise ValueError(f"unsupported job type: {job_type}")
+
+
+def get_review_job_code(job):
+    """Load the code and source label for a review batch job"""
+    if job.get('path'):
+        with open(job['path'], 'r', encoding='utf-8') as f:
+            return f.read(), f"File: {job['path']}"
+    if job.get('code'):
+        return job['code'], "Direct input"
+    raise ValueError("review jobs need a path or code")
+
+
+async def execute_job(job, stream_dir=None):
+    """Execute a single batch job"""
+    if job['type'] == 'review':
+        code_content, code_source = get_review_job_code(job)
+        return await asyncio.to_thread(review_code, code_content, code_source)
+    
+    agent, task, task_type = build_job_task(job)
+    use_cache = not job.get('no_cache', False)
+    if job['type'] == 'doc' and DOC_CONFIG['fan_out']:
+        result = await asyncio.to_thread(generate_document, task.description, use_cache)
+        if result is not None:
+            return result
+    
+    stream_sink = create_stream_sink(job['id'], echo=False, stream_dir=stream_dir) if stream_dir else None
+    result = await run_crew_async(
+        agent, task, use_cache=use_cache,
+        stream_sink=stream_sink, task_type=task_type
+    )
+    
+    if stream_sink is not None and stream_sink.ttft is not None:
+        return {'output': str(result), 'ttft_seconds': round(stream_sink.ttft, 3)}
+    return result
+
+
+def run_batch_mode(args):
+    """Run a JSONL file of tasks without the interactive menu"""
+    logger.info(f"Starting batch run: {args.batch}")
+    
+    if not check_api_keys():
+        sys.exit(1)
+    
+    try:
+        jobs = load_jobs(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not load batch file: {e}")
+        sys.exit(1)
+    
+    output_path = args.output or f"batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    metrics_store.start_background_flush(PERFORMANCE_CONFIG['flush_interval_seconds'])
+    start_metrics_exporter()
+    print(f"[BATCH] Running {len(jobs)} jobs with concurrency {args.concurrency}")
+    
+    batch_start = datetime.now()
+    summary = asyncio.run(run_batch(
+        jobs, lambda job: execute_job(job, args.stream_dir), output_path, args.concurrency
+    ))
+    
+    metrics_store.flush()
+    response_cache.flush()
+    unit_review_cache.flush()
+    
+    print(f"\n[BATCH] {summary['succeeded']}/{summary['total']} jobs succeeded, {summary['failed']} failed")
+    print(f"[BATCH] Duration: {format_duration(datetime.now() - batch_start)}")
+    print(f"[BATCH] Results written to: {os.path.abspath(output_path)}")
+    print_session_stats()
+    logger.info(f"Batch run finished: {summary}")
+
+
+def print_session_stats():
+    """Summarize request metrics and crew reuse for the session"""
+    summary = request_metrics.format_summary()
+    if summary:
+        print("\n[STATS] Request metrics by agent and task type:")
+        print(summary)
+    
+    pool_stats = crew_pool.stats()
+    if pool_stats['reuses']:
+        print(f"[STATS] Crews built: {pool_stats['builds']}, reused: {pool_stats['reuses']} "
+              f"(avg build {pool_stats['avg_build_ms']:.1f}ms vs swap {pool_stats['avg_swap_ms']:.2f}ms, "
+              f"saved {pool_stats['saved_seconds']:.2f}s)")
+    
+    limit_stats = rate_limiter.stats()
+    if limit_stats['calls']:
+        print(f"[STATS] LLM calls: {limit_stats['calls']}, rate limited: {limit_stats['rate_limited']}, "
+              f"retried: {limit_stats['retries']} (avg queue wait {limit_stats['avg_wait_seconds']:.2f}s)")
+    
+    semantic_stats = semantic_cache.stats()
+    if semantic_stats['hits']:
+        print(f"[STATS] Near-duplicate requests answered from cache: {semantic_stats['hits']} of "
+              f"{semantic_stats['hits'] + semantic_stats['misses']} ({semantic_stats['hit_rate']:.0%})")
+    
+    budget_stats = token_budget.stats()
+    if budget_stats['rejected']:
+        print(f"[STATS] Requests rejected before sending (prompt too large for the model): "
+              f"{budget_stats['rejected']}")
+    for task_type, accuracy in sorted(budget_stats['task_types'].items()):
+        print(f"[STATS] Prompt tokens for {task_type}: estimated {accuracy['estimated']} vs actual "
+              f"{accuracy['actual']} ({accuracy['error']:+.0%}, {tokenizer_name()}) "
+              f"over {accuracy['requests']} requests")
+    
+    hedge_stats = request_hedger.stats()
+    if hedge_stats['hedges']:
+        print(f"[STATS] Hedged calls: {hedge_stats['hedges']} of {hedge_stats['calls']} "
+              f"({hedge_stats['hedge_rate']:.0%}), duplicate answered first: {hedge_stats['hedge_wins']}")
+    
+    route_stats = model_router.stats()
+    for model, health in sorted(route_stats['models'].items()):
+        latency = f"{health['latency']:.2f}s" if health['latency'] is not None else "-"
+        print(f"[STATS] Model {model}: {health['calls']} calls, {health['errors']} errors, "
+              f"smoothed latency {latency}{'' if health['healthy'] else ' (cooling down)'}")
+    
+    http_stats = http_client.stats()
+    if http_stats['requests']:
+        print(f"[STATS] HTTP requests: {http_stats['requests']}, new connections: {http_stats['connections']}, "
+              f"reused: {http_stats['reused']} ({http_stats['reuse_rate']:.0%}), "
+              f"HTTP/2 {'enabled' if http_stats['http2'] else 'disabled'}, pool size {http_stats['pool_size']}")
+    
+    compression_stats = code_compressor.stats()
+    if compression_stats['saved_tokens']:
+        print(f"[STATS] Review input compression: ~{compression_stats['saved_tokens']} of "
+              f"{compression_stats['original_tokens']} tokens saved "
+              f"({compression_stats['saved_ratio']:.0%}) over {compression_stats['requests']} requests")
+    
+    for name, prompt_stats in PROMPTS.stats().items():
+        print(f"[STATS] Prompt {name}: {prompt_stats['renders']} renders, static prefix "
+              f"{prompt_stats['prefix_chars']} chars ({prompt_stats['prefix_share']:.0%} of prompt text)")
+
+
+def print_metrics_report():
+    """Print request metrics merged across every process that shares the store"""
+    aggregated = metrics_store.aggregate()
+    if not aggregated:
+        print("[INFO] No request metrics recorded yet")
+        return
+    
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+    
+    print("\n" + "="*SEPARATOR_WIDTH)
+    print("[STATS] MERGED REQUEST METRICS")
+    print("="*SEPARATOR_WIDTH)
+    for (agent, task_type), summary in sorted(aggregated.items()):
+        latency = summary['latency']
+        print(f"{agent} / {task_type}: {summary['requests']} requests from {summary['processes']} processes, "
+              f"{summary['errors']} errors, {summary['cache_hits']} cache hits")
+        print(f"    latency p50 {seconds(latency['p50'])}, p95 {seconds(latency['p95'])}, p99 {seconds(latency['p99'])}")
+        print(f"    tokens {summary['prompt_tokens']} prompt / {summary['completion_tokens']} completion")
+    
+    print("\n[STATS] Counters: " + ", ".join(f"{name}={value}" for name, value in metrics_store.counters().items()))
+    print("="*SEPARATOR_WIDTH)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument('--batch', metavar='TASKS_JSONL',
+                        help='Run a JSONL file of dev/doc/readme/review jobs without the menu')
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONFIG['concurrency'],
+                        help='Maximum number of jobs running at once in batch mode')
+    parser.add_argument('--output', default=BATCH_CONFIG['output_file'],
+                        help='Output JSONL file for batch results')
+    parser.add_argument('--stream-dir',
+                        help='Stream each batch job\'s tokens to a file in this directory')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the response and per-function review caches')
+    parser.add_argument('--metrics-report', action='store_true',
+                        help='Print metrics merged across all processes and exit')
+    return parser.parse_args(argv)
+
+
 def main():
     """Main application loop"""
     session_start = datetime.now()
     logger.info(f"Starting {APP_NAME} v{VERSION}")
     
-    # Initialize agents on first use
-    initialize_agents()
-    
     # Check API keys
     if not check_api_keys():
         print("\n[ERROR] Setup incomplete. Please run: python setup.py")
         return
     
+    # Load crewai in the background; agents are built on first use
+    preload_crewai()
+    metrics_store.start_background_flush(PERFORMANCE_CONFIG['flush_interval_seconds'])
+    start_metrics_exporter()
+    
     print("\n[INFO] Welcome to the CrewAI Workshop!")
     print("[INFO] Learn agentic AI with free tools and services")
     print(f"[INFO] Session started: {session_start.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -769,21 +1484,21 @@ def main():
             choice = int(input("\nEnter your choice (1, 2, 3, 4, 5, or 6): "))
             
             if choice == 1:
-                performance_metrics['dev_agent_calls'] += 1
+                metrics_store.increment('dev_agent_calls')
                 handle_dev_agent()
                 
             elif choice == 2:
-                performance_metrics['doc_agent_calls'] += 1
+                metrics_store.increment('doc_agent_calls')
                 handle_doc_agent()
                 
             elif choice == 3:
-                performance_metrics['readme_agent_calls'] += 1
+                metrics_store.increment('readme_agent_calls')
                 print("\n[INFO] Enhanced README Generator Selected!")
                 handle_readme_generation()
                 input("\n[INFO] Press Enter to continue...")
                 
             elif choice == 4:
-                performance_metrics['code_review_calls'] += 1
+                metrics_store.increment('code_review_calls')
                 print("\n[INFO] Code Review Agent Selected!")
                 handle_code_review()
                 input("\n[INFO] Press Enter to continue...")
@@ -797,10 +1512,16 @@ def main():
                 session_duration = session_end - session_start
                 formatted_duration = format_duration(session_duration)
                 
-                save_performance_metrics(performance_metrics)
+                metrics_store.flush()
+                response_cache.flush()
+                unit_review_cache.flush()
+                
+                cache_stats = response_cache.stats()
                 
                 logger.info(f"Session ended. Duration: {session_duration}")
                 print(f"\n[INFO] Session duration: {formatted_duration}")
+                print(f"[INFO] Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+                print_session_stats()
                 print("[INFO] Thank you for learning with CrewAI Workshop!")
                 print("[INFO] Exiting...")
                 break
@@ -820,4 +1541,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.no_cache:
+        response_cache.enabled = False
+        unit_review_cache.enabled = False
+    
+    if args.metrics_report:
+        print_metrics_report()
+    elif args.batch:
+        run_batch_mode(args)
+    else:
+        main()
@@ -0,0 +1,259 @@
+# Request latency, token throughput and error metrics per agent and task type
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_active_request = ContextVar('active_request_metrics', default=None)
+_handlers_lock = threading.Lock()
+_event_bus = None
+
+
+class Histogram:
+    """Bucketed latency observations with percentiles over recent samples"""
+
+    def __init__(self, max_samples=5000):
+        self.count = 0
+        self.total = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.samples = deque(maxlen=max_samples)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+                break
+
+    def percentile(self, percent):
+        """Nearest-rank percentile of the retained samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def cumulative_buckets(self):
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        buckets = []
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            running += count
+            buckets.append((bound, running))
+        buckets.append((float('inf'), self.count))
+        return buckets
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'buckets': self.cumulative_buckets(),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class RequestMetrics:
+    """Measurements collected while one request is in flight"""
+
+    def __init__(self, agent, task_type):
+        self.agent = agent
+        self.task_type = task_type
+        self.started_at = time.perf_counter()
+        self.ttft = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self.llm_errors = 0
+        # Prompt tokens of the first call made for the task itself
+        self.task_prompt_tokens = None
+        # Calls made outside the task, such as crewai's memory extraction
+        self.memory_calls = 0
+        self.cached = False
+
+
+class SeriesMetrics:
+    """Aggregated metrics for one (agent, task type) pair"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.llm_calls = 0
+        self.llm_errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.generation_seconds = 0.0
+        self.latency = Histogram()
+        self.ttft = Histogram()
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'llm_calls': self.llm_calls,
+            'llm_errors': self.llm_errors,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'tokens_per_second': self.completion_tokens / self.generation_seconds if self.generation_seconds else 0.0,
+            'latency': self.latency.summary(),
+            'ttft': self.ttft.summary(),
+        }
+
+
+class MetricsRecorder:
+    """Thread-safe registry of request metrics keyed by agent and task type"""
+
+    def __init__(self, store=None):
+        self.store = store
+        self._series = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, agent, task_type):
+        """Measure one request; LLM token usage inside the block is attributed to it"""
+        request = RequestMetrics(agent, task_type)
+        token = _active_request.set(request)
+        key = (agent, task_type)
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+        failed = False
+        try:
+            yield request
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Latency is taken before waiting on the event bus, which also
+            # delivers other requests' events
+            latency = time.perf_counter() - request.started_at
+            _active_request.reset(token)
+            if not request.cached:
+                _flush_llm_events()
+            self._record(request, latency, failed)
+            with self._lock:
+                self._in_flight[key] -= 1
+
+    def _record(self, request, latency, failed):
+        if self.store is not None:
+            self.store.append_request(
+                request.agent, request.task_type, latency, ttft=request.ttft,
+                prompt_tokens=request.prompt_tokens, completion_tokens=request.completion_tokens,
+                llm_calls=request.llm_calls, llm_errors=request.llm_errors,
+                cached=request.cached, error=failed
+            )
+        
+        with self._lock:
+            series = self._series.setdefault((request.agent, request.task_type), SeriesMetrics())
+            series.requests += 1
+            series.llm_calls += request.llm_calls
+            series.llm_errors += request.llm_errors
+            if failed:
+                series.errors += 1
+                return
+            if request.cached:
+                series.cache_hits += 1
+                return
+            series.latency.observe(latency)
+            if request.ttft is not None:
+                series.ttft.observe(request.ttft)
+            series.prompt_tokens += request.prompt_tokens
+            series.completion_tokens += request.completion_tokens
+            series.generation_seconds += latency - (request.ttft or 0.0)
+
+    def in_flight(self):
+        """Requests currently running, keyed by (agent, task type)"""
+        with self._lock:
+            return {key: count for key, count in self._in_flight.items() if count}
+
+    def snapshot(self):
+        """Summaries of every series, keyed by (agent, task type)"""
+        with self._lock:
+            return {key: series.summary() for key, series in self._series.items()}
+
+    def totals(self):
+        """Session-wide request, error and cache hit counts"""
+        totals = {'requests': 0, 'errors': 0, 'cache_hits': 0}
+        for summary in self.snapshot().values():
+            for name in totals:
+                totals[name] += summary[name]
+        totals['completed'] = totals['requests'] - totals['errors']
+        return totals
+
+    def format_summary(self):
+        """Human-readable per-agent, per-task-type summary"""
+        def seconds(value):
+            return f"{value:.2f}s" if value is not None else "-"
+
+        lines = []
+        for (agent, task_type), summary in sorted(self.snapshot().items()):
+            latency = summary['latency']
+            lines.append(f"{agent} / {task_type}: {summary['requests']} requests, "
+                         f"{summary['errors']} errors ({summary['llm_errors']} failed LLM calls), "
+                         f"{summary['cache_hits']} cache hits")
+            lines.append(f"    latency p50 {seconds(latency['p50'])}, p95 {seconds(latency['p95'])}, "
+                         f"p99 {seconds(latency['p99'])} | ttft p50 {seconds(summary['ttft']['p50'])}")
+            lines.append(f"    tokens {summary['prompt_tokens']} prompt / {summary['completion_tokens']} completion, "
+                         f"{summary['tokens_per_second']:.1f} tokens/s")
+        return "\n".join(lines)
+
+
+def active_request():
+    """The request being tracked in the current context, if any"""
+    return _active_request.get()
+
+
+def _on_llm_call_completed(source, event):
+    """Attribute provider-reported token usage to the active request"""
+    request = _active_request.get()
+    if request is None:
+        return
+    request.llm_calls += 1
+    usage = getattr(event, 'usage', None) or {}
+    prompt_tokens = usage.get('prompt_tokens', 0) or 0
+    request.prompt_tokens += prompt_tokens
+    request.completion_tokens += usage.get('completion_tokens', 0) or 0
+    if getattr(event, 'task_id', None) is None:
+        request.memory_calls += 1
+    elif request.task_prompt_tokens is None:
+        request.task_prompt_tokens = prompt_tokens
+
+
+def _on_llm_call_failed(source, event):
+    """Count a failed provider call against the active request"""
+    request = _active_request.get()
+    if request is not None:
+        request.llm_errors += 1
+
+
+def _flush_llm_events():
+    """Wait briefly for crewai to deliver pending LLM events to our handlers"""
+    flush = getattr(_event_bus, 'flush', None)
+    if flush is not None:
+        flush(timeout=2.0)
+
+
+def enable_llm_event_metrics():
+    """Register the crewai LLM event handlers once per process"""
+    global _event_bus
+    with _handlers_lock:
+        if _event_bus is not None:
+            return
+        try:
+            from crewai.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent
+        except ImportError:
+            from crewai.utilities.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent
+        crewai_event_bus.on(LLMCallCompletedEvent)(_on_llm_call_completed)
+        crewai_event_bus.on(LLMCallFailedEvent)(_on_llm_call_failed)
+        _event_bus = crewai_event_bus
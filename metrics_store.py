@@ -0,0 +1,249 @@
+# Crash-safe metrics store shared by concurrent processes
+#
+# Events are appended to a SQLite database in WAL mode, so several
+# workers can write side by side and readers never block writers.
+# Each process buffers events in memory and flushes them periodically,
+# so a crash loses at most one flush interval.
+
+import os
+import json
+import atexit
+import sqlite3
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS request_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    session TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    agent TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    latency REAL NOT NULL,
+    ttft REAL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    llm_errors INTEGER NOT NULL DEFAULT 0,
+    cached INTEGER NOT NULL DEFAULT 0,
+    error INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS counter_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    session TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    delta INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_request_events_series ON request_events (agent, task_type, recorded_at);
+"""
+
+DEFAULT_COUNTERS = ('dev_agent_calls', 'doc_agent_calls', 'readme_agent_calls', 'code_review_calls')
+
+
+class MetricsStore:
+    """Append-only SQLite (WAL) store of request and counter events
+
+    The database is opened on the first write or query, so importing a
+    module that holds a store creates no files.
+    """
+
+    def __init__(self, db_path, legacy_file=None, enabled=True):
+        self.db_path = db_path
+        self.legacy_file = legacy_file
+        self.enabled = enabled
+        self.session = uuid.uuid4().hex[:12]
+        self._pending_requests = []
+        self._pending_counters = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+        self._conn = None
+        if self.enabled:
+            atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _connection(self):
+        """The open database, connecting on first use; call with the lock held"""
+        if self._conn is None:
+            self._conn = self._connect()
+            if self.legacy_file:
+                self._import_legacy(self.legacy_file)
+        return self._conn
+
+    def _import_legacy(self, legacy_file):
+        """Carry counters over from the old performance_metrics.json once"""
+        if not os.path.exists(legacy_file):
+            return
+        if self._conn.execute("SELECT COUNT(*) FROM counter_events").fetchone()[0]:
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        rows = [(time.time(), 'legacy', os.getpid(), name, int(value))
+                for name, value in legacy.items() if isinstance(value, int) and value]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO counter_events (recorded_at, session, pid, name, delta) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def append_request(self, agent, task_type, latency, ttft=None, prompt_tokens=0,
+                       completion_tokens=0, llm_calls=0, llm_errors=0, cached=False, error=False):
+        """Buffer one finished request; it is written on the next flush"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending_requests.append((
+                time.time(), self.session, os.getpid(), agent, task_type, latency, ttft,
+                prompt_tokens, completion_tokens, llm_calls, llm_errors, int(cached), int(error)
+            ))
+
+    def increment(self, name, delta=1):
+        """Buffer a counter increment"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending_counters.append((time.time(), self.session, os.getpid(), name, delta))
+
+    def flush(self):
+        """Write buffered events in a single transaction"""
+        if not self.enabled:
+            return
+        with self._lock:
+            requests, self._pending_requests = self._pending_requests, []
+            counters, self._pending_counters = self._pending_counters, []
+            if not requests and not counters:
+                return
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO request_events (recorded_at, session, pid, agent, task_type, latency, ttft, "
+                        "prompt_tokens, completion_tokens, llm_calls, llm_errors, cached, error) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        requests
+                    )
+                    conn.executemany(
+                        "INSERT INTO counter_events (recorded_at, session, pid, name, delta) VALUES (?, ?, ?, ?, ?)",
+                        counters
+                    )
+            except sqlite3.Error as e:
+                # Keep the events for the next attempt rather than dropping them
+                self._pending_requests = requests + self._pending_requests
+                self._pending_counters = counters + self._pending_counters
+                print(f"Warning: Could not save metrics: {e}")
+
+    def start_background_flush(self, interval):
+        """Flush buffered events every interval seconds from a daemon thread"""
+        if not self.enabled or self._flusher is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def close(self):
+        """Stop the background flusher and write anything still buffered"""
+        if not self.enabled:
+            return
+        self._stop.set()
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.enabled = False
+
+    def counters(self):
+        """Counter totals merged across every process and session"""
+        totals = {name: 0 for name in DEFAULT_COUNTERS}
+        if not self.enabled:
+            return totals
+        self.flush()
+        with self._lock:
+            conn = self._connection()
+            for name, value in conn.execute(
+                    "SELECT name, SUM(delta) FROM counter_events GROUP BY name"):
+                totals[name] = value
+            totals['total_tasks_completed'] = totals.get('total_tasks_completed', 0) + conn.execute(
+                "SELECT COUNT(*) FROM request_events WHERE error = 0"
+            ).fetchone()[0]
+        return totals
+
+    def aggregate(self, since=None, session=None):
+        """Merged request metrics per (agent, task type) across every process
+
+        since limits results to events recorded after a Unix timestamp and
+        session to a single process run.
+        """
+        if not self.enabled:
+            return {}
+        self.flush()
+        where, params = ["1 = 1"], []
+        if since is not None:
+            where.append("recorded_at >= ?")
+            params.append(since)
+        if session is not None:
+            where.append("session = ?")
+            params.append(session)
+        clause = " AND ".join(where)
+
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                f"SELECT agent, task_type, COUNT(*), SUM(error), SUM(cached), SUM(llm_calls), SUM(llm_errors), "
+                f"SUM(prompt_tokens), SUM(completion_tokens), COUNT(DISTINCT pid) "
+                f"FROM request_events WHERE {clause} GROUP BY agent, task_type",
+                params
+            ).fetchall()
+            latencies = {}
+            for agent, task_type, latency in conn.execute(
+                    f"SELECT agent, task_type, latency FROM request_events "
+                    f"WHERE {clause} AND error = 0 AND cached = 0 ORDER BY latency",
+                    params):
+                latencies.setdefault((agent, task_type), []).append(latency)
+
+        results = {}
+        for agent, task_type, requests, errors, cache_hits, llm_calls, llm_errors, prompt, completion, processes in rows:
+            ordered = latencies.get((agent, task_type), [])
+            results[(agent, task_type)] = {
+                'requests': requests,
+                'errors': errors,
+                'cache_hits': cache_hits,
+                'llm_calls': llm_calls,
+                'llm_errors': llm_errors,
+                'prompt_tokens': prompt,
+                'completion_tokens': completion,
+                'processes': processes,
+                'latency': {
+                    'count': len(ordered),
+                    'sum': sum(ordered),
+                    'p50': _percentile(ordered, 50),
+                    'p95': _percentile(ordered, 95),
+                    'p99': _percentile(ordered, 99),
+                },
+            }
+        return results
+
+
+def _percentile(ordered, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[rank]
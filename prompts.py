@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Prompt templates with a stable static prefix
+
+Providers cache the longest prompt prefix they have already seen. Every
+template keeps its fixed instructions first, byte-identical on every call,
+and appends the per-request payload last so that prefix is reused.
+
+Usage:
+    python prompts.py [--update]
+
+Checks each template's prefix hash against prompt_prefixes.json, so an
+edit that would invalidate provider-side prefix caches is noticed.
+"""
+
+import os
+import sys
+import json
+import string
+import hashlib
+import argparse
+import textwrap
+import threading
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompt_prefixes.json')
+
+
+class PromptTemplate:
+    """Fixed instructions followed by a payload filled in per request"""
+
+    def __init__(self, name, instructions, payload):
+        self.name = name
+        # Compiled once: the prefix is never formatted, so it cannot vary between calls
+        self.prefix = textwrap.dedent(instructions).strip() + "\n\n"
+        self.payload = textwrap.dedent(payload).strip()
+        self.fields = {field for _, field, _, _ in string.Formatter().parse(self.payload) if field}
+        self.prefix_hash = hashlib.sha256(self.prefix.encode('utf-8')).hexdigest()[:16]
+
+    def render(self, **values):
+        """Prompt text with the payload fields filled in"""
+        missing = self.fields - set(values)
+        if missing:
+            raise KeyError(f"Prompt '{self.name}' is missing: {', '.join(sorted(missing))}")
+        return self.prefix + self.payload.format(**values)
+
+
+class PromptRegistry:
+    """Named prompt templates with render counts and prefix share per template"""
+
+    def __init__(self):
+        self.templates = {}
+        self.renders = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, instructions, payload):
+        """Compile and add a template"""
+        template = PromptTemplate(name, instructions, payload)
+        self.templates[name] = template
+        return template
+
+    def render(self, name, **values):
+        """Render a template by name"""
+        template = self.templates[name]
+        text = template.render(**values)
+        with self._lock:
+            stats = self.renders.setdefault(name, {'renders': 0, 'chars': 0})
+            stats['renders'] += 1
+            stats['chars'] += len(text)
+        return text
+
+    def prefix_hashes(self):
+        """Prefix hash of every template"""
+        return {name: template.prefix_hash for name, template in self.templates.items()}
+
+    def changed_prefixes(self, baseline):
+        """Templates whose prefix hash differs from a baseline {name: hash}"""
+        return sorted(name for name, prefix_hash in self.prefix_hashes().items()
+                      if baseline.get(name) != prefix_hash)
+
+    def stats(self):
+        """Renders and the share of rendered characters covered by the static prefix"""
+        with self._lock:
+            return {name: {
+                'renders': stats['renders'],
+                'prefix_chars': len(self.templates[name].prefix),
+                'prefix_share': (len(self.templates[name].prefix) * stats['renders'] / stats['chars']
+                                 if stats['chars'] else 0.0),
+            } for name, stats in self.renders.items()}
+
+
+PROMPTS = PromptRegistry()
+
+PROMPTS.register('code_review', """
+    Perform a comprehensive code review of the code given at the end of this prompt.
+
+    REVIEW REQUIREMENTS:
+
+    1.  BUG DETECTION:
+       - Identify potential runtime errors
+       - Check for logical errors
+       - Find edge cases that might cause issues
+
+    2.  SECURITY ANALYSIS:
+       - Check for security vulnerabilities
+       - Identify potential injection attacks
+       - Review input validation
+
+    3.  PERFORMANCE REVIEW:
+       - Identify performance bottlenecks
+       - Check algorithm efficiency
+       - Suggest optimization opportunities
+
+    4.  CODE QUALITY:
+       - Check adherence to coding standards
+       - Review naming conventions
+       - Assess code readability
+
+    5.  ARCHITECTURE & DESIGN:
+       - Review design patterns usage
+       - Check SOLID principles adherence
+       - Assess code structure
+
+    PROVIDE ACTIONABLE RECOMMENDATIONS:
+    - Specific feedback where applicable
+    - Code examples for suggested improvements
+    - Priority levels (Critical, High, Medium, Low)
+    - Rate overall code quality (1-10)
+
+    A SHARED CONTEXT block, when present, holds imports and signatures from the
+    rest of the file for reference only - do not review it.
+    """, """
+    SOURCE: {code_source}
+    {shared_context}
+    CODE TO REVIEW:
+    ```
+    {code}
+    ```
+    {unit_headings}
+    """)
+
+PROMPTS.register('readme', """
+    Create a professional, detailed, and emojified README.md file for the project
+    described in the PROJECT CONTEXT at the end of this prompt.
+
+    CREATE A COMPREHENSIVE README WITH:
+    1. [TARGET] Attractive title with relevant emojis and tagline
+    2. [STATS] Professional badges (GitHub, build status, version, license, etc.)
+    3.  Clear and compelling project description
+    4.  Comprehensive features list with emojis
+    5.  Complete technology stack section
+    6.  Detailed prerequisites and system requirements
+    7. [START] Step-by-step installation instructions
+    8. [TIP] Usage examples with realistic code snippets
+    9. [FILE] Project structure/architecture overview
+    10.  Configuration options and environment variables
+    11.  Testing instructions
+    12.  API documentation (if applicable)
+    13.  Contributing guidelines
+    14. [DOC] License information
+    15.  Authors/contributors section
+    16.  Support and contact information
+
+    QUALITY STANDARDS:
+    - Use professional markdown formatting
+    - Include appropriate emojis for visual appeal
+    - Ensure all code blocks have proper syntax highlighting
+    - Create realistic and functional examples
+    - Make it comprehensive yet readable
+    - Follow modern README best practices
+
+    If an IMPROVEMENT REQUEST follows the project context, address it and improve
+    the README accordingly.
+    """, """
+    PROJECT CONTEXT:
+    {project_context}
+    {improvement_request}
+    """)
+
+PROMPTS.register('readme_section', """
+    You are revising ONE section of an existing README.md. The other sections stay unchanged.
+
+    Rewrite only the CURRENT SECTION given below so it addresses the IMPROVEMENT REQUEST,
+    keeping the README's style, emojis and markdown formatting. Return only the section.
+    """, """
+    PROJECT CONTEXT:
+    {project_context}
+
+    README OUTLINE:
+    {outline}
+
+    CURRENT SECTION ({label}):
+    {section}
+
+    IMPROVEMENT REQUEST: {feedback}
+
+    Start the section with {start}.
+    """)
+
+
+def load_baseline(path=BASELINE_FILE):
+    """Prefix hashes recorded in the baseline file, or {} if there is none"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """Compare prefix hashes with the baseline and exit non-zero if any changed"""
+    parser = argparse.ArgumentParser(description="Prompt prefix-hash stability check")
+    parser.add_argument("--update", action="store_true",
+                        help="Record the current prefix hashes as the new baseline")
+    args = parser.parse_args()
+
+    if args.update:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(PROMPTS.prefix_hashes(), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"[OK] Recorded prefix hashes of {len(PROMPTS.templates)} templates")
+        return
+
+    baseline = load_baseline()
+    for name, template in PROMPTS.templates.items():
+        print(f"[INFO] {name}: prefix {template.prefix_hash}, {len(template.prefix)} chars")
+
+    changed = PROMPTS.changed_prefixes(baseline)
+    if changed:
+        print(f"[ERROR] Prefix changed for: {', '.join(changed)} "
+              f"(provider prefix caches will miss; run with --update if intended)")
+        sys.exit(1)
+
+    print("[OK] All prompt prefixes are stable")
+
+
+if __name__ == "__main__":
+    main()
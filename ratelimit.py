@@ -0,0 +1,243 @@
+# Client-side rate limiting for GROQ calls
+#
+# Two token buckets (requests per minute and tokens per minute) gate every
+# LLM call. GROQ limits each model separately, so every model gets its own
+# buckets and queue. Callers for a model are served strictly in arrival
+# order, so large requests are not starved by small ones, and a 429 pauses
+# that model's queue for the provider's retry-after interval instead of
+# letting each caller retry alone.
+
+import re
+import time
+import random
+import threading
+from config import RATE_LIMIT_CONFIG
+from utils import estimate_tokens
+
+RETRY_IN_PATTERN = re.compile(r"try again in (?:(\d+)m)?([\d.]+)(ms|s)", re.IGNORECASE)
+
+
+class TokenBucket:
+    """Bucket holding up to capacity units, refilled continuously per second"""
+
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount, now):
+        """Seconds until amount units are available"""
+        self._refill(now)
+        missing = amount - self.available
+        return max(missing / self.refill_per_second, 0.0)
+
+    def consume(self, amount):
+        self.available -= amount
+
+    def refund(self, amount):
+        self.available = min(self.capacity, self.available + amount)
+
+    def drain(self):
+        self.available = min(self.available, 0.0)
+
+
+def _iter_error_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def is_rate_limit_error(error):
+    """True when an exception (or its cause) is a provider 429"""
+    for candidate in _iter_error_chain(error):
+        if getattr(candidate, 'status_code', None) == 429:
+            return True
+        message = str(candidate).lower()
+        if 'rate limit' in message or 'too many requests' in message:
+            return True
+    return False
+
+
+def retry_after_seconds(error):
+    """Seconds the provider asked us to wait, from headers or the error message"""
+    for candidate in _iter_error_chain(error):
+        response = getattr(candidate, 'response', None)
+        for headers in (getattr(candidate, 'litellm_response_headers', None), getattr(response, 'headers', None)):
+            if not headers:
+                continue
+            try:
+                if headers.get('retry-after-ms'):
+                    return float(headers['retry-after-ms']) / 1000
+                if headers.get('retry-after'):
+                    return float(headers['retry-after'])
+            except (TypeError, ValueError):
+                pass
+        match = RETRY_IN_PATTERN.search(str(candidate))
+        if match:
+            minutes, value, unit = match.groups()
+            seconds = float(value) / 1000 if unit.lower() == 'ms' else float(value)
+            return int(minutes or 0) * 60 + seconds
+    return None
+
+
+def estimate_request_tokens(messages, max_tokens):
+    """Worst-case tokens for a chat request: the prompt plus the completion limit"""
+    if isinstance(messages, str):
+        prompt = estimate_tokens(messages)
+    else:
+        prompt = sum(estimate_tokens(str(message.get('content') or '')) + 4 for message in messages)
+    return prompt, prompt + (max_tokens or 0)
+
+
+class ModelLimits:
+    """Request and token buckets, 429 pause and FIFO queue of one model"""
+
+    def __init__(self, rpm, tpm):
+        self.requests = TokenBucket(rpm, rpm / 60)
+        self.tokens = TokenBucket(tpm, tpm / 60)
+        self.paused_until = 0.0
+        self.next_ticket = 0
+        self.serving = 0
+
+
+class RateLimiter:
+    """Per-model FIFO scheduler over request and token buckets with 429-aware backoff"""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_retries=None,
+                 max_backoff_seconds=None, enabled=None):
+        self.enabled = RATE_LIMIT_CONFIG['enabled'] if enabled is None else enabled
+        self.rpm = requests_per_minute or RATE_LIMIT_CONFIG['requests_per_minute']
+        self.tpm = tokens_per_minute or RATE_LIMIT_CONFIG['tokens_per_minute']
+        self.max_retries = RATE_LIMIT_CONFIG['max_retries'] if max_retries is None else max_retries
+        self.max_backoff_seconds = max_backoff_seconds or RATE_LIMIT_CONFIG['max_backoff_seconds']
+        self.models = {}
+        self._condition = threading.Condition()
+        self.calls = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+
+    def limits(self, model=None):
+        """Buckets and queue of a model, created on first use; call with the condition held"""
+        limits = self.models.get(model)
+        if limits is None:
+            limits = self.models[model] = ModelLimits(self.rpm, self.tpm)
+        return limits
+
+    def acquire(self, tokens, model=None):
+        """Block until this caller is first in its model's line and both buckets allow it"""
+        tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+        with self._condition:
+            limits = self.limits(model)
+            ticket = limits.next_ticket
+            limits.next_ticket += 1
+            while True:
+                timeout = None
+                if ticket == limits.serving:
+                    now = time.monotonic()
+                    timeout = max(limits.paused_until - now,
+                                  limits.requests.wait_time(1, now),
+                                  limits.tokens.wait_time(tokens, now))
+                    if timeout <= 0:
+                        limits.requests.consume(1)
+                        limits.tokens.consume(tokens)
+                        limits.serving += 1
+                        self.calls += 1
+                        self.wait_seconds += now - started
+                        self._condition.notify_all()
+                        return tokens
+                self._condition.wait(timeout)
+
+    def reconcile(self, reserved, actual, model=None):
+        """Return over-reserved tokens once the real size of a call is known"""
+        if actual < reserved:
+            with self._condition:
+                self.limits(model).tokens.refund(reserved - actual)
+                self._condition.notify_all()
+
+    def backoff(self, retry_after, attempt, model=None):
+        """Pause a model's callers after a 429, for retry-after or an exponential delay"""
+        if retry_after is None:
+            retry_after = min(self.max_backoff_seconds, 2 ** attempt) * random.uniform(0.8, 1.2)
+        with self._condition:
+            limits = self.limits(model)
+            self.rate_limited += 1
+            limits.paused_until = max(limits.paused_until,
+                                      time.monotonic() + min(retry_after, self.max_backoff_seconds))
+            limits.requests.drain()
+            limits.tokens.drain()
+            self._condition.notify_all()
+
+    def run(self, operation, estimated_tokens, actual_tokens=None, model=None):
+        """Run operation within a model's limits, retrying provider 429s
+
+        actual_tokens, if given, maps the result to the tokens it really used.
+        Tokens reserved for a call that fails with any other error are refunded.
+        """
+        if not self.enabled:
+            return operation()
+        for attempt in range(self.max_retries + 1):
+            reserved = self.acquire(estimated_tokens, model)
+            try:
+                result = operation()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    self.reconcile(reserved, 0, model)
+                    raise
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                self.backoff(retry_after_seconds(e), attempt, model)
+                continue
+            if actual_tokens is not None:
+                self.reconcile(reserved, actual_tokens(result), model)
+            return result
+
+    def wrap(self, llm):
+        """Route every call of a crewai LLM through the limiter"""
+        if not self.enabled:
+            return llm
+        try:
+            # The limiter owns 429 backoff; skip crewai's uncoordinated per-call retry
+            from crewai.llms.retry import _active_llm_rate_limit_retry
+        except ImportError:
+            _active_llm_rate_limit_retry = None
+        call = llm.call
+
+        def limited_call(messages, *args, **kwargs):
+            prompt, estimated = estimate_request_tokens(messages, getattr(llm, 'max_tokens', None))
+
+            def operation():
+                if _active_llm_rate_limit_retry is None:
+                    return call(messages, *args, **kwargs)
+                token = _active_llm_rate_limit_retry.set(True)
+                try:
+                    return call(messages, *args, **kwargs)
+                finally:
+                    _active_llm_rate_limit_retry.reset(token)
+
+            return self.run(operation, estimated, lambda result: prompt + estimate_tokens(str(result)),
+                            model=getattr(llm, 'model', None))
+
+        # crewai LLMs are pydantic models, which reject assigning undeclared attributes
+        object.__setattr__(llm, 'call', limited_call)
+        return llm
+
+    def stats(self):
+        """Calls, provider 429s, retries and time spent queued this session"""
+        return {
+            'calls': self.calls,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+            'wait_seconds': self.wait_seconds,
+            'avg_wait_seconds': self.wait_seconds / self.calls if self.calls else 0.0,
+        }
@@ -0,0 +1,86 @@
+# Addressable README sections for incremental regeneration
+
+import re
+
+# Topics a README section can cover, with the words that identify them
+SECTION_TOPICS = {
+    'title': ['title', 'tagline', 'name', 'header', 'intro', 'introduction'],
+    'badges': ['badge', 'shield'],
+    'description': ['description', 'overview', 'about', 'purpose', 'what it does'],
+    'features': ['feature', 'functionality', 'capabilit'],
+    'tech': ['tech', 'technolog', 'stack', 'built with', 'dependenc', 'librar', 'framework'],
+    'prerequisites': ['prerequisite', 'requirement'],
+    'installation': ['install', 'setup', 'set up', 'getting started', 'quick start'],
+    'usage': ['usage', 'example', 'how to use', 'snippet', 'demo'],
+    'structure': ['structure', 'architecture', 'layout', 'folder', 'director'],
+    'configuration': ['config', 'environment', 'env', 'variable', 'setting', 'option'],
+    'testing': ['test', 'coverage'],
+    'api': ['api', 'endpoint', 'reference'],
+    'contributing': ['contribut', 'pull request'],
+    'license': ['license', 'licence'],
+    'authors': ['author', 'credit', 'team', 'acknowledg', 'maintainer'],
+    'support': ['support', 'contact', 'help', 'issue', 'faq'],
+}
+
+# The text before the first "## " heading holds the title, badges and description
+PREAMBLE_TOPICS = {'title', 'badges', 'description'}
+
+
+def _topics(text):
+    """Topics whose identifying words start a word in text"""
+    text = text.lower()
+    return {topic for topic, words in SECTION_TOPICS.items()
+            if any(re.search(r'\b' + re.escape(word), text) for word in words)}
+
+
+def split_readme_sections(markdown):
+    """Split a README into its preamble and "## " sections, ignoring code blocks
+
+    Returns a list of {'heading', 'text'} dicts; the preamble's heading is empty.
+    """
+    sections = [{'heading': '', 'lines': []}]
+    in_code = False
+    for line in str(markdown).strip().splitlines():
+        if line.lstrip().startswith('```'):
+            in_code = not in_code
+        if not in_code and line.startswith('## '):
+            sections.append({'heading': line.strip(), 'lines': []})
+        sections[-1]['lines'].append(line)
+
+    result = [{'heading': section['heading'], 'text': "\n".join(section['lines']).strip()}
+              for section in sections]
+    return [section for section in result if section['text']]
+
+
+def join_readme_sections(sections):
+    """Reassemble sections into a README in their original order"""
+    return "\n\n".join(section['text'].strip() for section in sections) + "\n"
+
+
+def section_label(section):
+    """Human-readable name of a section"""
+    return section['heading'].lstrip('#').strip() or "Title & introduction"
+
+
+def match_feedback_sections(feedback, sections):
+    """Indices of the sections a piece of feedback is about"""
+    feedback_topics = _topics(feedback)
+    feedback_text = feedback.lower()
+    matches = []
+    for index, section in enumerate(sections):
+        topics = _topics(section['heading']) if section['heading'] else PREAMBLE_TOPICS
+        heading_words = re.findall(r'[a-z]{4,}', section['heading'].lower())
+        if topics & feedback_topics or any(word in feedback_text for word in heading_words):
+            matches.append(index)
+    return matches
+
+
+def clean_section_output(output, section):
+    """Strip code fences wrapped around a regenerated section and keep its heading"""
+    text = str(output).strip()
+    fenced = re.match(r"^```(?:markdown|md)?\s*\n(.*)\n```$", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1).strip()
+    if section['heading'] and not text.startswith('## '):
+        text = f"{section['heading']}\n\n{text}"
+    return text
@@ -0,0 +1,155 @@
+# Task-class model routing
+#
+# Each (agent, task type) pair maps to a route: a model with its own
+# max_tokens and temperature. Routes may list candidate models; with the
+# latency policy the fastest healthy candidate is picked per request.
+
+import time
+import threading
+from config import ROUTING_CONFIG
+
+
+class ModelHealth:
+    """Smoothed latency and error streak of one model"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.error_streak = 0
+        self.latency = None
+        self.unhealthy_until = 0.0
+
+
+class ModelRouter:
+    """Resolves agent and task type to a model profile and builds one LLM per profile"""
+
+    def __init__(self, llm_builder, routes=None, task_routes=None, policy=None, enabled=None):
+        self.llm_builder = llm_builder
+        self.routes = routes if routes is not None else ROUTING_CONFIG['routes']
+        self.task_routes = task_routes if task_routes is not None else ROUTING_CONFIG['task_routes']
+        self.policy = policy or ROUTING_CONFIG['policy']
+        self.enabled = ROUTING_CONFIG['enabled'] if enabled is None else enabled
+        self.max_tokens_buckets = sorted(ROUTING_CONFIG['max_tokens_buckets'])
+        self.smoothing = ROUTING_CONFIG['latency_smoothing']
+        self.max_error_streak = ROUTING_CONFIG['max_error_streak']
+        self.cooldown_seconds = ROUTING_CONFIG['cooldown_seconds']
+        self.route_counts = {}
+        self._health = {}
+        self._llms = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, agent_name, task_type):
+        """Profile for a request, or None to use the agent's own LLM
+
+        Routes are looked up by "agent/task_type", then task type, then agent.
+        """
+        route_name = self._route_name(agent_name, task_type)
+        if route_name is None:
+            return None
+
+        route = self.routes[route_name]
+        with self._lock:
+            self.route_counts[route_name] = self.route_counts.get(route_name, 0) + 1
+        return {
+            'route': route_name,
+            'primary_model': route['model'],
+            'model': self._pick_model(route),
+            'max_tokens': route['max_tokens'],
+            'temperature': route['temperature'],
+        }
+
+    def _route_name(self, agent_name, task_type):
+        """Name of the route a request takes, or None to use the agent's own LLM"""
+        if not self.enabled:
+            return None
+        for key in (f"{agent_name}/{task_type}", task_type, agent_name):
+            route_name = self.task_routes.get(key)
+            if route_name:
+                return route_name
+        return None
+
+    def route_model(self, agent_name, task_type):
+        """Primary model of a request's route without counting it, or None"""
+        route_name = self._route_name(agent_name, task_type)
+        return self.routes[route_name]['model'] if route_name else None
+
+    def _pick_model(self, route):
+        """The route's model, or with the latency policy its fastest healthy candidate"""
+        candidates = route.get('candidates') or [route['model']]
+        if self.policy != 'latency' or len(candidates) == 1:
+            return route['model']
+
+        now = time.monotonic()
+        with self._lock:
+            healthy = [model for model in candidates
+                       if self._health.get(model, ModelHealth()).unhealthy_until <= now]
+            if not healthy:
+                return route['model']
+            # Untried models sort first so every candidate gets measured
+            return min(healthy, key=lambda model: self._health.get(model, ModelHealth()).latency or 0.0)
+
+    def max_tokens_bucket(self, max_tokens):
+        """Largest bucket not above max_tokens, or max_tokens itself below the smallest bucket"""
+        fitting = [bucket for bucket in self.max_tokens_buckets if bucket <= max_tokens]
+        return fitting[-1] if fitting else max_tokens
+
+    def llm_for(self, profile):
+        """Shared LLM for a profile, built on first use"""
+        key = (profile['model'], self.max_tokens_bucket(profile['max_tokens']), profile['temperature'])
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                # The builder applies observe to the bare LLM, before rate limiting
+                # wraps it, so time spent queued locally is not counted as latency
+                model = profile['model']
+                llm = self.llm_builder(*key, observe=lambda bare_llm: self._observe_calls(bare_llm, model))
+                self._llms[key] = llm
+            return llm
+
+    def _observe_calls(self, llm, model):
+        """Feed the latency and outcome of every provider call into the model's health"""
+        call = llm.call
+
+        def observed_call(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = call(*args, **kwargs)
+            except Exception:
+                self.observe(model, time.monotonic() - started, ok=False)
+                raise
+            self.observe(model, time.monotonic() - started)
+            return result
+
+        # crewai LLMs are pydantic models, which reject assigning undeclared attributes
+        object.__setattr__(llm, 'call', observed_call)
+
+    def observe(self, model, latency, ok=True):
+        """Record one call; repeated failures take the model out of rotation for a while"""
+        with self._lock:
+            health = self._health.setdefault(model, ModelHealth())
+            health.calls += 1
+            if not ok:
+                health.errors += 1
+                health.error_streak += 1
+                if health.error_streak >= self.max_error_streak:
+                    health.unhealthy_until = time.monotonic() + self.cooldown_seconds
+                return
+            health.error_streak = 0
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.smoothing * (latency - health.latency)
+
+    def stats(self):
+        """Requests per route and calls, errors and smoothed latency per model"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'routes': dict(self.route_counts),
+                'models': {model: {
+                    'calls': health.calls,
+                    'errors': health.errors,
+                    'latency': health.latency,
+                    'healthy': health.unhealthy_until <= now,
+                } for model, health in self._health.items()},
+            }
@@ -0,0 +1,234 @@
+# Near-duplicate cache for free-text requests
+#
+# Requests are reduced to their content words in order (lowercased, with
+# stop words and boilerplate such as "write a function that" dropped and
+# common suffixes stripped), shingled into word bigrams and signed with
+# MinHash. Bigrams keep word order, and direction words such as "to" are
+# kept, so "celsius to fahrenheit" never matches "fahrenheit to celsius".
+# Signatures live in a fixed-size numpy matrix, so a lookup compares a
+# request against every cached one in a single vectorized pass. No
+# embedding service is needed.
+#
+# numpy is imported on first use to keep CLI startup fast.
+#
+# Usage:
+#     python semantic_cache.py
+#
+# checks that known near-duplicates match and reversed requests do not.
+
+import re
+import sys
+import time
+import hashlib
+import threading
+from config import SEMANTIC_CACHE_CONFIG
+
+# Universal hashing modulus for MinHash (a Mersenne prime small enough that
+# a * hash + b never overflows uint64)
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Words that give a request its direction ("convert X to Y") and must not be dropped
+DIRECTION_WORDS = frozenset(['to', 'from', 'into', 'as'])
+
+STOP_WORDS = frozenset("""
+    a an the and or of in on for with by at is are be it its this that these those
+    which who what how please can could would should will i me my we you your some any all if whether
+    write create make build implement generate give show need want using use python code
+    function program script method simple small quick short new
+""".split())
+
+
+def _stem(word):
+    """Strip plural and verb suffixes so "reverses", "reversing" and "reverse" match"""
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('es') and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    return word.rstrip('e') if len(word) > 3 else word
+
+
+def content_words(text):
+    """Stemmed words of a request that carry its meaning, in order"""
+    words = [_stem(word) for word in re.findall(r"[a-z0-9]+", str(text).lower()) if word not in STOP_WORDS]
+    # A leading or trailing direction word ("how to ...") joins nothing
+    while words and words[0] in DIRECTION_WORDS:
+        words.pop(0)
+    while words and words[-1] in DIRECTION_WORDS:
+        words.pop()
+    return words
+
+
+def shingles(text):
+    """Ordered word bigrams of a request, or its single content word"""
+    words = content_words(text)
+    if len(words) < 2:
+        return set(words)
+    return {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+def _word_hash(word):
+    digest = hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % MERSENNE_PRIME
+
+
+class SemanticCache:
+    """In-memory MinHash index mapping near-identical requests to earlier results"""
+
+    def __init__(self, threshold=None, num_perm=None, max_entries=None, ttl_seconds=None, enabled=None):
+        self.enabled = SEMANTIC_CACHE_CONFIG['enabled'] if enabled is None else enabled
+        self.threshold = threshold or SEMANTIC_CACHE_CONFIG['threshold']
+        self.num_perm = num_perm or SEMANTIC_CACHE_CONFIG['num_perm']
+        self.max_entries = max_entries or SEMANTIC_CACHE_CONFIG['max_entries']
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else SEMANTIC_CACHE_CONFIG['ttl_seconds']
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = [None] * self.max_entries
+        self._namespaces = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _ensure_index(self):
+        """Allocate the signature matrix and hash parameters on first use"""
+        if self._index is not None:
+            return
+        import numpy as np
+        with self._lock:
+            if self._index is not None:
+                return
+            rng = np.random.default_rng(SEMANTIC_CACHE_CONFIG['seed'])
+            self._a = rng.integers(1, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+            self._b = rng.integers(0, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+            self._index = {
+                'signatures': np.zeros((self.max_entries, self.num_perm), dtype=np.uint64),
+                'namespaces': np.full(self.max_entries, -1, dtype=np.int64),
+                'last_used': np.zeros(self.max_entries, dtype=np.float64),
+            }
+
+    def signature(self, text):
+        """MinHash signature of a request's word bigrams, or None if it has no content words"""
+        import numpy as np
+        request_shingles = shingles(text)
+        if not request_shingles:
+            return None
+        self._ensure_index()
+        hashes = np.array([_word_hash(shingle) for shingle in sorted(request_shingles)], dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(MERSENNE_PRIME)
+        return permuted.min(axis=0)
+
+    def _namespace_id(self, namespace):
+        return self._namespaces.setdefault(namespace, len(self._namespaces))
+
+    def _expired(self, entry, now):
+        return self.ttl_seconds > 0 and now - entry['created_at'] > self.ttl_seconds
+
+    def get(self, text, namespace='default'):
+        """Closest cached entry at or above the similarity threshold, or None
+
+        Returns a dict with the cached 'value', the original request 'text'
+        and the estimated 'similarity'.
+        """
+        if not self.enabled:
+            return None
+        import numpy as np
+        signature = self.signature(text)
+        with self._lock:
+            if signature is None:
+                self.misses += 1
+                return None
+            index = self._index
+            candidates = np.flatnonzero(index['namespaces'] == self._namespace_id(namespace))
+            if candidates.size:
+                similarity = (index['signatures'][candidates] == signature).mean(axis=1)
+                best = int(np.argmax(similarity))
+                slot = int(candidates[best])
+                entry = self.entries[slot]
+                now = time.time()
+                if self._expired(entry, now):
+                    self._free(slot)
+                elif similarity[best] >= self.threshold:
+                    index['last_used'][slot] = now
+                    self.hits += 1
+                    return {'value': entry['value'], 'text': entry['text'],
+                            'similarity': float(similarity[best])}
+            self.misses += 1
+            return None
+
+    def set(self, text, value, namespace='default'):
+        """Remember the result of a request, evicting the least recently used entry when full"""
+        if not self.enabled:
+            return
+        import numpy as np
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            index = self._index
+            free = np.flatnonzero(index['namespaces'] < 0)
+            if free.size:
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(index['last_used']))
+                self.evictions += 1
+            now = time.time()
+            index['signatures'][slot] = signature
+            index['namespaces'][slot] = self._namespace_id(namespace)
+            index['last_used'][slot] = now
+            self.entries[slot] = {'text': str(text), 'value': value, 'created_at': now}
+
+    def _free(self, slot):
+        self._index['namespaces'][slot] = -1
+        self._index['last_used'][slot] = 0.0
+        self.entries[slot] = None
+
+    def stats(self):
+        """Return hit/miss counters for this session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': sum(entry is not None for entry in self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Requests that must share an answer, and requests that must not
+SAME_REQUESTS = [
+    ("write a function that reverses a string", "reverse a string"),
+    ("write a python function to check if a number is prime", "check whether a number is prime"),
+]
+DIFFERENT_REQUESTS = [
+    ("convert celsius to fahrenheit", "convert fahrenheit to celsius"),
+    ("convert a string to an integer", "convert an integer to a string"),
+    ("parse json into a dict", "parse a dict into json"),
+]
+
+
+def main():
+    """Check known near-duplicates hit and reversed requests miss, exiting non-zero otherwise"""
+    failures = []
+    for pairs, should_hit in ((SAME_REQUESTS, True), (DIFFERENT_REQUESTS, False)):
+        for cached_text, request_text in pairs:
+            cache = SemanticCache(enabled=True, max_entries=4, ttl_seconds=0)
+            cache.set(cached_text, 'answer')
+            hit = cache.get(request_text) is not None
+            print(f"[{'OK' if hit == should_hit else 'ERROR'}] {'hit ' if hit else 'miss'} "
+                  f"\"{request_text}\" after \"{cached_text}\"")
+            if hit != should_hit:
+                failures.append(request_text)
+
+    if failures:
+        print(f"[ERROR] {len(failures)} requests matched wrongly")
+        sys.exit(1)
+    print("[OK] Near-duplicates match and reversed requests do not")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Token streaming from LLM calls to the terminal and output files
+
+import os
+import sys
+import time
+import threading
+from contextvars import ContextVar
+
+_active_sink = ContextVar('active_stream_sink', default=None)
+_handler_lock = threading.Lock()
+_handler_registered = False
+
+
+class StreamSink:
+    """Receives streamed chunks for one request and records time-to-first-token"""
+
+    def __init__(self, echo=True, output_file=None):
+        self.echo = echo
+        self.output_file = output_file
+        self.chunk_count = 0
+        self.started_at = None
+        self.first_token_at = None
+        self._file = None
+        self._token = None
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        if self.output_file:
+            output_dir = os.path.dirname(self.output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            self._file = open(self.output_file, 'a', encoding='utf-8')
+        self._token = _active_sink.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_sink.reset(self._token)
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.echo and self.chunk_count:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        return False
+
+    @property
+    def ttft(self):
+        """Seconds from request start to the first streamed chunk"""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    def write(self, chunk):
+        """Render a chunk to the terminal and append it to the output file"""
+        if not chunk:
+            return
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunk_count += 1
+        if self.echo:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        if self._file:
+            self._file.write(chunk)
+            self._file.flush()
+
+
+def streaming_active():
+    """True when chunks in the current context are routed to a sink"""
+    return _active_sink.get() is not None
+
+
+def _on_stream_chunk(source, event):
+    """Route a crewai stream chunk event to the sink active in this context"""
+    sink = _active_sink.get()
+    if sink is not None:
+        sink.write(event.chunk)
+
+
+def enable_streaming():
+    """Register the crewai stream chunk handler once per process"""
+    global _handler_registered
+    with _handler_lock:
+        if _handler_registered:
+            return
+        try:
+            from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+        except ImportError:
+            from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+        crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+        _handler_registered = True
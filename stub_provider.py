@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stub of the GROQ chat completions API
+
+Answers every request with a canned Final Answer after an optional delay and
+enforces its own requests-per-minute limit, replying 429 with a Retry-After
+header once it is exceeded. A share of requests can be made slow outliers.
+Point the workshop at it to exercise the rate limiter and request hedging
+without spending real quota.
+
+Usage:
+    python stub_provider.py [--port 8099] [--rpm 20] [--latency 0.5]
+                            [--outlier-rate 0.1] [--outlier-latency 10]
+    GROQ_BASE_URL=http://127.0.0.1:8099/v1 python main.py
+"""
+
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_ANSWER = "Thought: I now can give a great answer\nFinal Answer: Stub response from the local provider."
+
+
+class StubState:
+    """Sliding-window request counter shared by every handler thread"""
+
+    def __init__(self, rpm, latency, fail_every=0, outlier_rate=0.0, outlier_latency=10.0):
+        self.rpm = rpm
+        self.latency = latency
+        self.fail_every = fail_every
+        self.outlier_rate = outlier_rate
+        self.outlier_latency = outlier_latency
+        self.outliers = 0
+        self.accepted = deque()
+        self.requests = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def admit(self):
+        """Return 0 when the request is admitted, else the seconds to wait"""
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            while self.accepted and now - self.accepted[0] >= 60:
+                self.accepted.popleft()
+            forced = self.fail_every and self.requests % self.fail_every == 0
+            if forced or (self.rpm and len(self.accepted) >= self.rpm):
+                self.rejected += 1
+                return max(60 - (now - self.accepted[0]), 0.1) if self.accepted and not forced else 1.0
+            self.accepted.append(now)
+            return 0
+
+    def response_delay(self):
+        """Seconds to wait before answering, occasionally an outlier"""
+        if self.outlier_rate and random.random() < self.outlier_rate:
+            with self.lock:
+                self.outliers += 1
+            return self.outlier_latency
+        return self.latency
+
+
+def make_handler(state):
+    """Build a request handler bound to the shared stub state"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': 'not found'}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+            retry_after = state.admit()
+            if retry_after:
+                self._send_json(429, {
+                    'error': {
+                        'message': f"Rate limit reached. Please try again in {retry_after:.2f}s.",
+                        'type': 'requests', 'code': 'rate_limit_exceeded',
+                    }
+                }, headers={'Retry-After': f"{retry_after:.2f}"})
+                return
+
+            time.sleep(state.response_delay())
+            prompt_tokens = sum(len(str(m.get('content', ''))) for m in request.get('messages', [])) // 4
+            completion_tokens = len(STUB_ANSWER) // 4
+            usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                     'total_tokens': prompt_tokens + completion_tokens}
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            model = request.get('model', 'stub')
+
+            if request.get('stream'):
+                self._stream(completion_id, model, usage)
+                return
+            self._send_json(200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': STUB_ANSWER}}],
+                'usage': usage, 'service_tier': 'on_demand',
+            })
+
+        def _stream(self, completion_id, model, usage):
+            """Send the answer as server-sent chat completion chunks"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+
+            def chunk(delta, finish_reason=None, with_usage=False):
+                payload = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                           'model': model, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]}
+                if with_usage:
+                    payload['usage'] = usage
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+
+            chunk({'role': 'assistant', 'content': ''})
+            for word in STUB_ANSWER.split(' '):
+                chunk({'content': word + ' '})
+            chunk({}, finish_reason='stop', with_usage=True)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub(host='127.0.0.1', port=8099, rpm=20, latency=0.5, fail_every=0,
+               outlier_rate=0.0, outlier_latency=10.0):
+    """Start the stub provider on a daemon thread and return (server, state)"""
+    state = StubState(rpm, latency, fail_every, outlier_rate, outlier_latency)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-provider', daemon=True).start()
+    return server, state
+
+
+def main():
+    """Run the stub provider until interrupted"""
+    parser = argparse.ArgumentParser(description="Local stub of the GROQ chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--rpm", type=int, default=20, help="Requests per minute before answering 429 (0 = unlimited)")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds to wait before answering")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with 429")
+    parser.add_argument("--outlier-rate", type=float, default=0.0, help="Share of requests answered slowly")
+    parser.add_argument("--outlier-latency", type=float, default=10.0, help="Seconds an outlier takes to answer")
+    args = parser.parse_args()
+
+    server, state = start_stub(args.host, args.port, args.rpm, args.latency, args.fail_every,
+                               args.outlier_rate, args.outlier_latency)
+    print(f"[INFO] Stub provider listening on http://{args.host}:{args.port}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n[STATS] {state.requests} requests, {state.rejected} answered with 429, {state.outliers} outliers")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
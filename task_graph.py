@@ -0,0 +1,150 @@
+# Dependency-driven scheduling of crew tasks
+#
+# Tasks declare the tasks they depend on. Every task whose dependencies have
+# finished runs at once in its own single-task crew, and receives the outputs
+# of its declared dependencies (and only those) as context.
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from framework import load_crewai
+
+
+class TaskNode:
+    """One task in the graph with its dependencies and timing"""
+
+    def __init__(self, name, task, depends_on):
+        self.name = name
+        self.task = task
+        self.depends_on = list(depends_on)
+        self.started = None
+        self.finished = None
+        self.output = None
+        self.error = None
+        self.skipped = False
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class TaskGraph:
+    """Runs crew tasks as a DAG, each task as soon as its dependencies are done"""
+
+    def __init__(self, verbose=False, max_workers=None):
+        self.verbose = verbose
+        self.max_workers = max_workers
+        self.nodes = {}
+        self.started = None
+        self.finished = None
+        self._agent_locks = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, task, depends_on=()):
+        """Add a task; its dependencies must already be in the graph, so cycles cannot form"""
+        if name in self.nodes:
+            raise ValueError(f"Task '{name}' is already in the graph")
+        missing = [dependency for dependency in depends_on if dependency not in self.nodes]
+        if missing:
+            raise ValueError(f"Task '{name}' depends on unknown tasks: {', '.join(missing)}")
+        self.nodes[name] = TaskNode(name, task, depends_on)
+        return task
+
+    def run(self):
+        """Run every task, returning {name: output}
+
+        Tasks downstream of a failure are skipped; the first failure is
+        raised once everything that could run has finished.
+        """
+        for node in self.nodes.values():
+            node.started = node.finished = node.output = node.error = None
+            node.skipped = False
+            # Only declared dependencies are passed on as context
+            node.task.context = [self.nodes[dependency].task for dependency in node.depends_on]
+
+        workers = self.max_workers or max(1, len(self.nodes))
+        pending = dict(self.nodes)
+        running = {}
+        self.started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-graph') as pool:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    dependencies = [self.nodes[dependency] for dependency in node.depends_on]
+                    if any(dependency.error is not None or dependency.skipped
+                           for dependency in dependencies):
+                        node.skipped = True
+                        del pending[name]
+                        print(f"[SKIP] {name}: an upstream task failed")
+                    elif all(dependency.finished is not None for dependency in dependencies):
+                        del pending[name]
+                        running[pool.submit(self._run_node, node)] = node
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+
+        self.finished = time.perf_counter()
+        failed = [node for node in self.nodes.values() if node.error is not None]
+        if failed:
+            raise failed[0].error
+        return {name: node.output for name, node in self.nodes.items()}
+
+    def _agent_lock(self, agent):
+        # An agent runs one task at a time, so tasks sharing one take turns
+        with self._lock:
+            return self._agent_locks.setdefault(id(agent), threading.Lock())
+
+    def _run_node(self, node):
+        crewai = load_crewai()
+        with self._agent_lock(node.task.agent):
+            node.started = time.perf_counter()
+            try:
+                print(f"[START] {node.name}")
+                crew = crewai.Crew(agents=[node.task.agent], tasks=[node.task], verbose=self.verbose)
+                node.output = crew.kickoff()
+                print(f"[OK] {node.name} finished in {time.perf_counter() - node.started:.2f}s")
+            except Exception as e:
+                node.error = e
+                print(f"[ERROR] {node.name} failed: {e}")
+            finally:
+                node.finished = time.perf_counter()
+
+    def critical_path(self):
+        """Chain of tasks that determined the total run time, first task first"""
+        finished = [node for node in self.nodes.values() if node.finished is not None]
+        if not finished:
+            return []
+        node = max(finished, key=lambda candidate: candidate.finished)
+        path = [node]
+        while node.depends_on:
+            # The dependency that finished last is the one this task waited for
+            node = max((self.nodes[dependency] for dependency in node.depends_on),
+                       key=lambda candidate: candidate.finished or 0.0)
+            path.append(node)
+        return list(reversed(path))
+
+    def print_timing(self):
+        """Print when each task ran and the critical path through the graph"""
+        if self.started is None or self.finished is None:
+            return
+        wall = self.finished - self.started
+        total = sum(node.duration for node in self.nodes.values())
+
+        print("\n[TIMING] Task schedule:")
+        for node in sorted(self.nodes.values(), key=lambda candidate: candidate.started or float('inf')):
+            if node.started is None:
+                print(f"  {node.name}: skipped")
+                continue
+            after = f" (after {', '.join(node.depends_on)})" if node.depends_on else ""
+            print(f"  {node.name}: {node.started - self.started:.2f}s -> "
+                  f"{node.finished - self.started:.2f}s, {node.duration:.2f}s{after}")
+
+        path = self.critical_path()
+        print(f"[TIMING] Critical path: "
+              f"{' -> '.join(f'{node.name} ({node.duration:.2f}s)' for node in path)}")
+        speedup = f", {total / wall:.1f}x faster" if wall > 0 else ""
+        print(f"[TIMING] Wall time {wall:.2f}s vs {total:.2f}s running tasks one by one{speedup}")
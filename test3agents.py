@@ -1,12 +1,14 @@
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task
 from dotenv import load_dotenv
 import os
 
 # Only for tools
-from langchain.tools import BaseTool
-from typing import Optional, Type
+from typing import Type
 from pydantic import BaseModel, Field
 
+from tools import AsyncTool, IDEMPOTENT, tool_cache, print_tool_stats
+from task_graph import TaskGraph
+
 # Load your OpenAI key from .env file
 load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
@@ -15,18 +17,19 @@ os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 class InstallSoftwareInput(BaseModel):
     command: str = Field(..., description="The shell command to run for installation")
 
-class InstallSoftwareTool(BaseTool):
-    name = "InstallSoftware"
-    description = "Installs software on a machine by executing setup commands."
+class InstallSoftwareTool(AsyncTool):
+    name: str = "InstallSoftware"
+    description: str = "Installs software on a machine by executing setup commands."
 
     args_schema: Type[BaseModel] = InstallSoftwareInput
+    # Each call is an independent, I/O-bound install, so calls can overlap
+    concurrency_safe: bool = True
+    # Re-running an install is a no-op, so repeated calls reuse the earlier result
+    side_effects: str = IDEMPOTENT
 
-    def _run(self, command: str, run_manager=None) -> str:
+    def _run(self, command: str) -> str:
         return f"Simulating: Executing install command -> {command}"
 
-    def _arun(self, *args, **kwargs):
-        raise NotImplementedError("Async not implemented")
-
 # Define the tool instance
 install_tool = InstallSoftwareTool()
 
@@ -72,14 +75,17 @@ task3 = Task(
     agent=tester
 )
 
-# CREW
-crew = Crew(
-    agents=[technician, security, tester],
-    tasks=[task1, task2, task3],
-    verbose=True
-)
+# TASK GRAPH
+# Setup and security are independent and run in parallel; tests need both
+graph = TaskGraph(verbose=True)
+graph.add("setup", task1)
+graph.add("security", task2)
+graph.add("tests", task3, depends_on=["setup", "security"])
 
 if __name__ == "__main__":
-    result = crew.kickoff()
+    outputs = graph.run()
     print("\n📦 Final Output:")
-    print(result)
\ No newline at end of file
+    print(outputs["tests"])
+    graph.print_timing()
+    print_tool_stats()
+    tool_cache().flush()
\ No newline at end of file
@@ -0,0 +1,162 @@
+# Pre-flight token estimates and per-task max_tokens budgets
+#
+# Prompts are measured before each call with a local tiktoken encoding when
+# it is available (litellm ships the encoding files, so nothing is
+# downloaded) and with a characters-per-token heuristic otherwise. Each task
+# type gets its own completion budget, capped by what is left of the
+# model's context window; prompts that cannot fit are rejected up front.
+
+import os
+import threading
+import importlib.util
+from functools import lru_cache
+from config import TOKEN_CONFIG
+
+_encoding = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+# Texts longer than this are counted without being kept in the cache
+CACHED_TEXT_MAX_CHARS = 20000
+
+
+class ContextWindowExceeded(Exception):
+    """A prompt is too large for the model's context window"""
+
+
+def _bundled_tiktoken_cache():
+    """Directory of the tiktoken encoding files bundled with litellm, if installed"""
+    spec = importlib.util.find_spec('litellm')
+    if spec is None or not spec.origin:
+        return None
+    path = os.path.join(os.path.dirname(spec.origin), 'litellm_core_utils', 'tokenizers')
+    return path if os.path.isdir(path) else None
+
+
+def _load_encoding():
+    """tiktoken encoding on first use, or None when only the heuristic is available"""
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed or TOKEN_CONFIG['tokenizer'] != 'tiktoken':
+        return _encoding
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                if not os.environ.get('TIKTOKEN_CACHE_DIR'):
+                    bundled = _bundled_tiktoken_cache()
+                    if bundled:
+                        os.environ['TIKTOKEN_CACHE_DIR'] = bundled
+                import tiktoken
+                _encoding = tiktoken.get_encoding(TOKEN_CONFIG['encoding'])
+            except Exception:
+                # Not installed, or the encoding is not cached and cannot be downloaded
+                _encoding_failed = True
+    return _encoding
+
+
+def tokenizer_name():
+    """Encoding used for estimates, or 'heuristic'"""
+    return TOKEN_CONFIG['encoding'] if _load_encoding() is not None else 'heuristic'
+
+
+def heuristic_tokens(text):
+    """Roughly four characters per token"""
+    return max(1, len(text) // 4) if text else 0
+
+
+@lru_cache(maxsize=4096)
+def _cached_count(text):
+    return _count(text)
+
+
+def _count(text):
+    encoding = _load_encoding()
+    if encoding is None:
+        return heuristic_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text):
+    """Estimated number of LLM tokens in a piece of text"""
+    if not text:
+        return 0
+    text = str(text)
+    return _cached_count(text) if len(text) <= CACHED_TEXT_MAX_CHARS else _count(text)
+
+
+class TokenBudget:
+    """Sizes max_tokens per task type and compares estimated with actual prompt tokens"""
+
+    def __init__(self, budgets=None, context_windows=None, enabled=None):
+        self.enabled = TOKEN_CONFIG['budgeting'] if enabled is None else enabled
+        self.budgets = budgets if budgets is not None else TOKEN_CONFIG['budgets']
+        self.context_windows = (context_windows if context_windows is not None
+                                else TOKEN_CONFIG['context_windows'])
+        self.prompt_overhead = TOKEN_CONFIG['prompt_overhead']
+        self.tool_prompt_overhead = TOKEN_CONFIG['tool_prompt_overhead']
+        self.memory_prompt_overhead = TOKEN_CONFIG['memory_prompt_overhead']
+        self.min_completion_tokens = TOKEN_CONFIG['min_completion_tokens']
+        self.rejected = 0
+        self._accuracy = {}
+        self._lock = threading.Lock()
+
+    def context_window(self, model):
+        """Context window of a model in tokens"""
+        return self.context_windows.get(model, TOKEN_CONFIG['default_context_window'])
+
+    def estimate_prompt(self, agent, task, tools=None):
+        """Prompt tokens of a single-agent task, including the framework's own prompt text
+
+        tools are the tools listed in the prompt, each rendered with its arguments.
+        """
+        parts = [agent.role, agent.goal, agent.backstory, task.description, task.expected_output]
+        overhead = self.prompt_overhead
+        if tools:
+            parts.extend(getattr(tool, 'formatted_description', None) or tool.description for tool in tools)
+            overhead += self.tool_prompt_overhead
+        return sum(count_tokens(part) for part in parts) + overhead
+
+    def estimate_memory_prompt(self, agent, task, max_tokens):
+        """Prompt tokens of the memory extraction call crewai makes after a memory agent's task
+
+        That call sends the task text together with the answer, which can be up to max_tokens long.
+        """
+        parts = [agent.role, task.description, task.expected_output]
+        return sum(count_tokens(part) for part in parts) + max_tokens + self.memory_prompt_overhead
+
+    def check(self, model, prompt_tokens):
+        """Tokens left for the answer, raising ContextWindowExceeded if the prompt cannot fit"""
+        available = self.context_window(model) - prompt_tokens
+        if available < self.min_completion_tokens:
+            with self._lock:
+                self.rejected += 1
+            raise ContextWindowExceeded(
+                f"Prompt of ~{prompt_tokens} tokens leaves no room for an answer in the "
+                f"{self.context_window(model)}-token context of {model}; shorten or split the input"
+            )
+        return available
+
+    def plan(self, model, task_type, prompt_tokens, default_max_tokens):
+        """max_tokens for a request, raising ContextWindowExceeded if the prompt cannot fit"""
+        available = self.check(model, prompt_tokens)
+        budget = self.budgets.get(task_type, default_max_tokens) if self.enabled else default_max_tokens
+        return min(budget, available)
+
+    def record(self, task_type, estimated_prompt_tokens, actual_prompt_tokens):
+        """Track how far estimates were from the provider's usage counts"""
+        if not actual_prompt_tokens:
+            return
+        with self._lock:
+            accuracy = self._accuracy.setdefault(task_type, {'requests': 0, 'estimated': 0, 'actual': 0})
+            accuracy['requests'] += 1
+            accuracy['estimated'] += estimated_prompt_tokens
+            accuracy['actual'] += actual_prompt_tokens
+
+    def stats(self):
+        """Rejections and estimated vs actual prompt tokens per task type"""
+        with self._lock:
+            return {
+                'rejected': self.rejected,
+                'task_types': {task_type: dict(accuracy, error=(accuracy['estimated'] - accuracy['actual'])
+                                               / accuracy['actual'])
+                               for task_type, accuracy in self._accuracy.items()},
+            }
@@ -0,0 +1,182 @@
+# Async-capable tools for crewai agents
+#
+# AsyncTool gives every tool an async entry point: sync _run
+# implementations are offloaded to a bounded thread pool shared by all
+# tools. Tools that are safe to run concurrently say so; every other tool
+# runs one call at a time, however it is invoked.
+#
+# Tools also declare their side effects. Results of pure and idempotent
+# tools are memoized on disk, keyed on the tool name and its canonicalized
+# arguments, so repeated calls within and across runs skip the tool.
+
+import json
+import time
+import asyncio
+import hashlib
+import threading
+import contextvars
+from contextlib import nullcontext
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import PrivateAttr
+from crewai.tools import BaseTool
+from config import TOOL_CONFIG
+from cache import ResponseCache
+
+# Side effects a tool can declare
+PURE = 'pure'                       # Result depends only on the arguments
+IDEMPOTENT = 'idempotent'           # Repeating a call changes nothing, but results can go stale
+SIDE_EFFECTING = 'side_effecting'   # Every call must really run
+
+_executor = None
+_executor_lock = threading.Lock()
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def tool_executor():
+    """Thread pool that runs sync tool calls, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TOOL_CONFIG['max_workers'],
+                                               thread_name_prefix='tool')
+    return _executor
+
+
+def tool_cache():
+    """Result cache shared by every tool, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ToolResultCache()
+    return _cache
+
+
+def make_tool_cache_key(tool_name, arguments):
+    """Stable key for a call, independent of argument order and positional use"""
+    payload = json.dumps([tool_name, arguments], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ToolResultCache:
+    """Memoized results of pure and idempotent tool calls with per-tool hit rates"""
+
+    def __init__(self, store=None, ttl_seconds=None):
+        # Expiry depends on the tool's declaration, so entries carry their own deadline
+        self.store = store or ResponseCache(
+            cache_file=TOOL_CONFIG['cache_file'],
+            max_entries=TOOL_CONFIG['cache_max_entries'],
+            ttl_seconds=0,
+            enabled=TOOL_CONFIG['cache_enabled'],
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else TOOL_CONFIG['cache_ttl_seconds']
+        self.tools = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool_name, outcome):
+        with self._lock:
+            counts = self.tools.setdefault(tool_name, {'hits': 0, 'misses': 0, 'uncached': 0})
+            counts[outcome] += 1
+
+    def call(self, tool_name, side_effects, arguments, function):
+        """Return the memoized result of a call, running function on a miss"""
+        if side_effects not in (PURE, IDEMPOTENT) or not self.store.enabled:
+            self._count(tool_name, 'uncached')
+            return function()
+
+        key = make_tool_cache_key(tool_name, arguments)
+        entry = self.store.get(key)
+        if entry is not None and (entry['expires_at'] is None or entry['expires_at'] > time.time()):
+            self._count(tool_name, 'hits')
+            return entry['result']
+
+        self._count(tool_name, 'misses')
+        result = function()
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            # Only JSON results can be stored on disk
+            return result
+        expires_at = None if side_effects == PURE or self.ttl_seconds <= 0 else time.time() + self.ttl_seconds
+        self.store.set(key, {'result': result, 'expires_at': expires_at})
+        return result
+
+    def flush(self):
+        """Persist pending LRU order changes"""
+        self.store.flush()
+
+    def stats(self):
+        """Hits, misses, uncached calls and hit rate per tool"""
+        with self._lock:
+            stats = {}
+            for tool_name, counts in self.tools.items():
+                lookups = counts['hits'] + counts['misses']
+                stats[tool_name] = dict(counts, hit_rate=counts['hits'] / lookups if lookups else 0.0)
+            return stats
+
+
+def print_tool_stats():
+    """Print call counts and cache hit rates of every tool used this session"""
+    for tool_name, stats in tool_cache().stats().items():
+        calls = stats['hits'] + stats['misses'] + stats['uncached']
+        print(f"[STATS] Tool {tool_name}: {calls} calls, {stats['hits']} cache hits "
+              f"({stats['hit_rate']:.0%} of cacheable calls)")
+
+
+class AsyncTool(BaseTool):
+    """Tool whose sync _run can also be awaited without blocking the event loop"""
+
+    # Whether several calls of this tool may run at the same time
+    concurrency_safe: bool = False
+    # PURE, IDEMPOTENT or SIDE_EFFECTING; only the first two are memoized
+    side_effects: str = SIDE_EFFECTING
+
+    _call_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _exclusive(self):
+        return nullcontext() if self.concurrency_safe else self._call_lock
+
+    def _run_exclusive(self, *args, **kwargs):
+        # Positional arguments are keyed by name so both call styles share entries
+        arguments = dict(zip(self.args_schema.model_fields, args), **kwargs)
+
+        def run_locked():
+            with self._exclusive():
+                return self._run(*args, **kwargs)
+
+        return tool_cache().call(self.name, self.side_effects, arguments, run_locked)
+
+    def run(self, *args, **kwargs):
+        if not args:
+            kwargs = self._validate_kwargs(kwargs)
+        limit_error = self._claim_usage()
+        if limit_error:
+            return limit_error
+        return self._run_exclusive(*args, **kwargs)
+
+    async def _arun(self, *args, **kwargs):
+        """Run the sync implementation on the tool thread pool"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            tool_executor(), partial(context.run, self._run_exclusive, *args, **kwargs)
+        )
+
+    def to_structured_tool(self):
+        # Agents call the structured tool's func directly, so route it through the lock too
+        structured_tool = super().to_structured_tool()
+        structured_tool.func = self._run_exclusive
+        return structured_tool
+
+
+async def gather_tool_calls(calls):
+    """Run independent (tool, kwargs) calls at once, returning results in order"""
+    return await asyncio.gather(*(tool.arun(**kwargs) for tool, kwargs in calls))
+
+
+def run_tool_calls(calls):
+    """Blocking version of gather_tool_calls for code outside an event loop"""
+    return asyncio.run(gather_tool_calls(calls))
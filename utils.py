@@ -1,34 +1,8 @@
 # Utility functions for Enhanced AI Agent System
 
 import os
-import json
 from datetime import datetime
-from config import PERFORMANCE_CONFIG
-
-def save_performance_metrics(metrics):
-    """Save performance metrics to file"""
-    if PERFORMANCE_CONFIG['save_metrics']:
-        try:
-            with open(PERFORMANCE_CONFIG['metrics_file'], 'w') as f:
-                json.dump(metrics, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save metrics: {e}")
-
-def load_performance_metrics():
-    """Load performance metrics from file"""
-    try:
-        if os.path.exists(PERFORMANCE_CONFIG['metrics_file']):
-            with open(PERFORMANCE_CONFIG['metrics_file'], 'r') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {
-        'dev_agent_calls': 0,
-        'doc_agent_calls': 0,
-        'readme_agent_calls': 0,
-        'code_review_calls': 0,
-        'total_tasks_completed': 0
-    }
+from token_budget import count_tokens
 
 def format_duration(duration):
     """Format duration in a human-readable way"""
@@ -61,4 +35,8 @@ def validate_file_path(file_path):
         else:
             return False, "File is not readable"
     except Exception as e:
-        return False, f"Error validating file: {e}"
\ No newline at end of file
+        return False, f"Error validating file: {e}"
+
+def estimate_tokens(text):
+    """Estimate the number of LLM tokens in a piece of text"""
+    return count_tokens(text)